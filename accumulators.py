@@ -0,0 +1,183 @@
+import math
+from typing import List
+
+class ExactSum:
+    __slots__ = ("partials",)
+
+    def __init__(self):
+        self.partials = []
+
+    def add(self, value: float) -> None:
+        partials = self.partials
+        i = 0
+        for partial in partials:
+            if abs(value) < abs(partial):
+                value, partial = partial, value
+            high = value + partial
+            low = partial - (high - value)
+            if low:
+                partials[i] = low
+                i += 1
+            value = high
+        partials[i:] = [value]
+
+    def merge(self, other: 'ExactSum') -> 'ExactSum':
+        for partial in other.partials:
+            self.add(partial)
+        return self
+
+    def value(self) -> float:
+        return math.fsum(self.partials)
+
+    def to_state(self) -> List[float]:
+        return list(self.partials)
+
+    @classmethod
+    def from_state(cls, state: List[float]) -> 'ExactSum':
+        total = cls()
+        total.partials = list(state)
+        return total
+
+class TDigest:
+    __slots__ = ("compression", "means", "weights", "buffer")
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+
+    def __getstate__(self) -> tuple:
+        self.compress()
+        return self.compression, self.means, self.weights
+
+    def __setstate__(self, state: tuple) -> None:
+        self.compression, self.means, self.weights = state
+        self.buffer = []
+
+    def to_state(self) -> dict:
+        self.compress()
+        return {"compression": self.compression, "means": list(self.means), "weights": list(self.weights)}
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'TDigest':
+        digest = cls(state["compression"])
+        digest.means, digest.weights = list(state["means"]), list(state["weights"])
+        return digest
+
+    def scale(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0), 1) - 1)
+
+    def inverse_scale(self, k: float) -> float:
+        return (math.sin(min(k * 2 * math.pi / self.compression, math.pi / 2)) + 1) / 2
+
+    def add(self, value: float, weight: float = 1) -> None:
+        if weight == 1:
+            self.buffer.append(value)
+        else:
+            self.means.append(value)
+            self.weights.append(weight)
+        if len(self.buffer) >= self.compression * 5:
+            self.compress()
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        self.means.extend(other.means)
+        self.weights.extend(other.weights)
+        self.buffer.extend(other.buffer)
+        self.compress()
+        return self
+
+    def compress(self) -> None:
+        if not self.buffer and not self.means:
+            return
+        points = sorted(zip(self.means + self.buffer, self.weights + [1] * len(self.buffer)))
+        self.buffer = []
+        total = sum(weight for _, weight in points)
+        means, weights = [], []
+        mean, weight = points[0]
+        so_far = 0
+        limit = self.inverse_scale(self.scale(0) + 1) * total
+        for next_mean, next_weight in points[1:]:
+            if so_far + weight + next_weight <= limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                so_far += weight
+                limit = self.inverse_scale(self.scale(so_far / total) + 1) * total
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q: float) -> float:
+        self.compress()
+        if not self.means:
+            return math.nan
+        target = q * sum(self.weights)
+        cumulative = 0
+        previous_center, previous_mean = None, None
+        for mean, weight in zip(self.means, self.weights):
+            center = cumulative + weight / 2
+            if target <= center:
+                if previous_center is None:
+                    return mean
+                return previous_mean + (mean - previous_mean) * (target - previous_center) / (center - previous_center)
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+        return self.means[-1]
+
+class SalaryAccumulator:
+    __slots__ = ("count", "total", "min", "max", "digest")
+
+    def __init__(self, compression: int = 100):
+        self.count = 0
+        self.total = ExactSum()
+        self.min = math.inf
+        self.max = -math.inf
+        self.digest = TDigest(compression)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total.add(value)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.digest.add(value)
+
+    def merge(self, other: 'SalaryAccumulator') -> 'SalaryAccumulator':
+        self.count += other.count
+        self.total.merge(other.total)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.digest.merge(other.digest)
+        return self
+
+    def to_state(self) -> dict:
+        return {"count": self.count, "total": self.total.to_state(), "min": self.min, "max": self.max,
+                "digest": self.digest.to_state()}
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'SalaryAccumulator':
+        accumulator = cls()
+        accumulator.count = state["count"]
+        accumulator.total = ExactSum.from_state(state["total"])
+        accumulator.min, accumulator.max = state["min"], state["max"]
+        accumulator.digest = TDigest.from_state(state["digest"])
+        return accumulator
+
+    def sum(self) -> float:
+        return self.total.value()
+
+    def mean(self) -> float:
+        return self.sum() / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return math.nan
+        return min(max(self.digest.quantile(q), self.min), self.max)
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        return [self.quantile(q) for q in qs]
@@ -0,0 +1,51 @@
+import heapq
+from typing import Callable, Dict, Hashable, List
+from accumulators import SalaryAccumulator
+
+class GroupBy:
+    def __init__(self, keys: Dict[str, Callable[[tuple], Hashable]], accumulator: type = SalaryAccumulator):
+        self.keys = keys
+        self.accumulator = accumulator
+        self.groups = {name: {} for name in keys}
+
+    def add(self, row: tuple, value: float) -> None:
+        for name, key in self.keys.items():
+            group = self.groups[name]
+            group_key = key(row)
+            accumulator = group.get(group_key)
+            if accumulator is None:
+                accumulator = group[group_key] = self.accumulator()
+            accumulator.add(value)
+
+    def merge(self, other: 'GroupBy') -> 'GroupBy':
+        for name, other_group in other.groups.items():
+            group = self.groups.setdefault(name, {})
+            for group_key, accumulator in other_group.items():
+                if group_key in group:
+                    group[group_key].merge(accumulator)
+                else:
+                    group[group_key] = accumulator
+        return self
+
+    def to_state(self) -> Dict[str, List[list]]:
+        return {name: [[group_key, accumulator.to_state()] for group_key, accumulator in group.items()]
+                for name, group in self.groups.items()}
+
+    @classmethod
+    def from_state(cls, keys: Dict[str, Callable[[tuple], Hashable]], state: Dict[str, List[list]],
+                   accumulator: type = SalaryAccumulator) -> 'GroupBy':
+        groups = cls(keys, accumulator)
+        for name, items in state.items():
+            groups.groups[name] = {tuple(group_key) if isinstance(group_key, list) else group_key: accumulator.from_state(value)
+                                   for group_key, value in items}
+        return groups
+
+    def top(self, name: str, n: int) -> List[tuple]:
+        return heapq.nlargest(n, self.groups[name].items(), key=lambda item: item[1].count)
+
+    def get_table(self, name: str, n: int = None) -> Dict[Hashable, Dict[str, float]]:
+        items = self.top(name, n) if n is not None else sorted(self.groups[name].items(), key=lambda item: str(item[0]))
+        total = sum(accumulator.count for accumulator in self.groups[name].values())
+        return {group_key: {"count": accumulator.count, "share": round(accumulator.count / total, 4),
+                            "average": int(accumulator.mean())}
+                for group_key, accumulator in items}
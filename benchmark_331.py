@@ -0,0 +1,27 @@
+import os
+import tempfile
+import time
+import pandas as pd
+from stub_cbr_server import StubCbrServer
+from task_331 import ProcessCurrencies
+
+def run(file_name: str, url: str, max_workers: int) -> tuple:
+    currencies = ProcessCurrencies(file_name, base_url=url, max_workers=max_workers, cache_file=None)
+    currencies.currencies_to_convert = ['RUR', 'USD', 'KZT', 'BYR', 'UAH', 'EUR']
+    months = currencies.get_months(currencies.min_date, currencies.max_date)
+    start = time.perf_counter()
+    rows = currencies.fetch_rows(months)
+    return time.perf_counter() - start, rows
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = os.path.join(tmp, 'vacancies.csv')
+        pd.DataFrame({'published_at': ['2003-01-24T10:00:00+0300', '2022-07-18T10:00:00+0300'],
+                      'salary_currency': ['RUR', 'USD']}).to_csv(file_name, index=False)
+        with StubCbrServer(latency=0.05) as server:
+            serial_time, serial_rows = run(file_name, f'{server.url}/XML_daily.asp', 1)
+            for workers in (4, 8, 16):
+                pool_time, pool_rows = run(file_name, f'{server.url}/XML_daily.asp', workers)
+                assert pool_rows == serial_rows
+                print(f'{len(serial_rows)} months: serial {serial_time:.2f}s, '
+                      f'{workers} workers {pool_time:.2f}s ({serial_time / pool_time:.1f}x)')
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from task_341 import ProcessSalaries
+
+def generate_vacancies(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    salary_from = rng.integers(10, 300, rows) * 1000.0
+    salary_to = salary_from + rng.integers(0, 100, rows) * 1000.0
+    salary_from[rng.random(rows) < 0.3] = np.nan
+    salary_to[rng.random(rows) < 0.4] = np.nan
+    currency = rng.choice(np.array(['RUR', 'USD', 'EUR', 'KZT', 'UAH', 'BYR', 'GBP', None], dtype=object), rows,
+                          p=[0.7, 0.08, 0.05, 0.05, 0.04, 0.04, 0.02, 0.02])
+    months = rng.integers(2003 * 12, 2022 * 12 + 7, rows)
+    published_at = [f'{m // 12}-{m % 12 + 1:02}-15T10:00:00+0300' for m in months]
+    return pd.DataFrame({'name': 'Программист', 'salary_from': salary_from, 'salary_to': salary_to,
+                         'salary_currency': currency, 'area_name': 'Москва', 'published_at': published_at})
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as tmp:
+        vacancies_file = os.path.join(tmp, 'vacancies.csv')
+        generate_vacancies(rows).to_csv(vacancies_file, index=False)
+        salaries = ProcessSalaries(vacancies_file, currencies_file='dataframe331.csv')
+        dataframe = pd.read_csv(vacancies_file)
+        start = time.perf_counter()
+        rowwise = salaries.convert_salaries_rowwise(dataframe)
+        rowwise_time = time.perf_counter() - start
+        start = time.perf_counter()
+        vectorized = salaries.convert_salaries(dataframe)
+        vectorized_time = time.perf_counter() - start
+        pd.testing.assert_frame_equal(rowwise.astype({'salary': float}), vectorized)
+        print(f'{rows} rows: rowwise {rowwise_time:.2f}s ({rows / rowwise_time:,.0f} rows/s), '
+              f'vectorized {vectorized_time:.3f}s ({rows / vectorized_time:,.0f} rows/s), '
+              f'{rowwise_time / vectorized_time:.0f}x')
@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import task_342
+from task_342 import Salary, get_currency_valute
+
+def read_csv_lookup(date: str, salary_currency: str) -> float:
+    if salary_currency == "RUR":
+        return 1
+    valutes = pd.read_csv(task_342.VALUTES_FILE)
+    valute = valutes.loc[valutes["date"] == date]
+    if valute.__contains__(salary_currency):
+        return float(valute[salary_currency].iloc[0])
+    return 0
+
+def generate_salaries(count: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    currencies = rng.choice(['RUR', 'USD', 'EUR', 'KZT', 'UAH'], count, p=[0.6, 0.1, 0.1, 0.1, 0.1])
+    months = rng.integers(2003 * 12, 2022 * 12 + 7, count)
+    return [Salary(str(1000 * rng.integers(10, 300)), "", currency,
+                   f"{month // 12}-{month % 12 + 1:02}-15T10:00:00+0300") for currency, month in zip(currencies, months)]
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        rates = pd.read_csv('dataframe51.csv')
+        rates['date'] = rates['date'].str[5:7] + '/' + rates['date'].str[:4]
+        task_342.VALUTES_FILE = os.path.join(tmp, 'valutes.csv')
+        rates.drop(columns=['RUR']).to_csv(task_342.VALUTES_FILE, index=False)
+        salaries = generate_salaries(count)
+        sample = salaries[:min(count, 500)]
+        start = time.perf_counter()
+        before = [round(((s.salary_from + s.salary_to) * read_csv_lookup(s.month_year, s.salary_currency)) / 2, 4)
+                  for s in sample]
+        before_cost = (time.perf_counter() - start) / len(sample)
+        start = time.perf_counter()
+        after = [s.get_average_salary() for s in salaries]
+        after_cost = (time.perf_counter() - start) / count
+        assert before == after[:len(sample)]
+        print(f'per vacancy: read_csv lookup {before_cost * 1e6:,.1f} us, '
+              f'shared rate table {after_cost * 1e6:,.2f} us ({before_cost / after_cost:,.0f}x), '
+              f'{get_currency_valute.cache_info().currsize} memoized (month, currency) pairs')
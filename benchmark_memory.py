@@ -0,0 +1,46 @@
+import gc
+import sys
+import tracemalloc
+from typing import Dict, Iterator
+from task_342 import Vacancy
+
+class LegacyVacancy:
+    def __init__(self, vacancy: Dict[str, str]):
+        self.name = vacancy["name"]
+        self.salary = LegacySalary(vacancy["salary_from"], vacancy["salary_to"],
+                                   vacancy["salary_currency"], vacancy["published_at"])
+        self.area_name = vacancy["area_name"]
+        self.published_at = vacancy["published_at"]
+        self.year = self.published_at[:4]
+
+class LegacySalary:
+    def __init__(self, salary_from: str, salary_to: str, salary_currency: str, published_at: str):
+        self.salary_from = float(salary_from or 0)
+        self.salary_to = float(salary_to or 0)
+        self.salary_currency = salary_currency
+        self.published_at = published_at
+        self.month_year = f"{self.published_at[5:7]}/{self.published_at[:4]}"
+
+def generate_rows(count: int) -> Iterator[Dict[str, str]]:
+    areas = ["Москва", "Санкт-Петербург", "Минск", "Алматы", "Казань"]
+    currencies = ["RUR", "RUR", "RUR", "USD", "EUR", "KZT"]
+    for i in range(count):
+        yield {"name": f"Программист {i % 1000}", "salary_from": f"{1000 * (i % 300)}.0", "salary_to": "",
+               "salary_currency": "".join(currencies[i % 6]), "area_name": "".join(areas[i % 5]),
+               "published_at": f"{2003 + i % 20}-{i % 12 + 1:02}-15T10:00:00+0300"}
+
+def bytes_per_vacancy(cls: type, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    vacancies = [cls(row) for row in generate_rows(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del vacancies
+    return size / count
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    legacy = bytes_per_vacancy(LegacyVacancy, count)
+    compact = bytes_per_vacancy(Vacancy, count)
+    print(f"{count} vacancies: __dict__ layout {legacy:.0f} B/vacancy, "
+          f"__slots__ layout {compact:.0f} B/vacancy ({1 - compact / legacy:.0%} less)")
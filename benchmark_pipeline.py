@@ -0,0 +1,136 @@
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from generate_vacancies import write_vacancies
+from metrics import get_peak_rss_mb
+
+REPO_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(REPO_DIRECTORY, "benchmark_baseline.json")
+
+def write_valutes(file_name: str) -> None:
+    with open(os.path.join(REPO_DIRECTORY, "dataframe51.csv"), encoding="utf-8") as source:
+        rows = list(csv.reader(source))
+    with open(file_name, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(rows[0][:1] + rows[0][2:])
+        writer.writerows([f"{row[0][5:7]}/{row[0][:4]}"] + [value or "0" for value in row[2:]] for row in rows[1:])
+
+def bench_dataset(file_name: str, rows: int, tmp: str) -> int:
+    from task_342 import DataSet
+    return len(DataSet(file_name).vacancies_objects)
+
+def bench_dataset_stream(file_name: str, rows: int, tmp: str) -> int:
+    from task_342 import DataSet, Statistic
+    return sum(1 for _ in DataSet.iter_rows(file_name, Statistic.columns))
+
+def bench_split(file_name: str, rows: int, tmp: str) -> int:
+    from task_342 import SplitCsvFileByYear
+    return sum(SplitCsvFileByYear(file_name, os.path.join(tmp, "vacancies_by_year")).year_counts.values())
+
+def bench_salaries(file_name: str, rows: int, tmp: str) -> int:
+    from task_341 import ProcessSalaries
+    ProcessSalaries(file_name, os.path.join(REPO_DIRECTORY, "dataframe331.csv")).salaries_process()
+    return rows
+
+def bench_statistic(file_name: str, rows: int, tmp: str) -> int:
+    import task_342
+    task_342.VALUTES_FILE = os.path.join(tmp, "valutes.csv")
+    year_vacancy = task_342.Statistic("Программист").process_data(file_name)[1]
+    return sum(year_vacancy.values())
+
+def bench_statistic_stream(file_name: str, rows: int, tmp: str) -> int:
+    import task_342
+    task_342.VALUTES_FILE = os.path.join(tmp, "valutes.csv")
+    year_vacancy = task_342.Statistic("Программист").process_data_stream(file_name)[1]
+    return sum(year_vacancy.values())
+
+def bench_report(file_name: str, rows: int, tmp: str) -> int:
+    from task_342 import Report
+    count = min(rows, 100000)
+    values = list(range(count))
+    Report("Программист", values, values, values, values, values, os.path.join(tmp, "report.xlsx")).generate_excel()
+    return count
+
+def bench_currencies(file_name: str, rows: int, tmp: str) -> int:
+    from stub_cbr_server import StubCbrServer
+    from task_331 import ProcessCurrencies
+    with StubCbrServer(latency=0) as server:
+        currencies = ProcessCurrencies(file_name, base_url=f"{server.url}/XML_daily.asp", cache_file=None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            currencies.create_currencies_to_convert(rows // 100)
+        currencies.generate_currency(currencies.min_date, currencies.max_date, os.path.join(tmp, "currencies.csv"))
+    return len(currencies.df)
+
+STAGES = {"DataSet": bench_dataset, "DataSet.iter_rows": bench_dataset_stream, "SplitCsvFileByYear": bench_split,
+          "ProcessSalaries.salaries_process": bench_salaries, "Statistic.process_data": bench_statistic,
+          "Statistic.process_data_stream": bench_statistic_stream, "Report.generate_excel": bench_report,
+          "ProcessCurrencies": bench_currencies}
+
+def run_stage(name: str, file_name: str, rows: int, tmp: str) -> dict:
+    os.chdir(tempfile.mkdtemp(prefix=name, dir=tmp))
+    start = time.perf_counter()
+    processed = STAGES[name](file_name, rows, tmp)
+    seconds = time.perf_counter() - start
+    return {"rows": processed, "seconds": round(seconds, 3), "rows_per_sec": round(processed / seconds),
+            "peak_rss_mb": round(get_peak_rss_mb(), 1)}
+
+def run_isolated(name: str, file_name: str, rows: int, tmp: str, repeat: int = 1) -> dict:
+    best = None
+    for _ in range(repeat):
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            result = executor.submit(run_stage, name, file_name, rows, tmp).result()
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+def load_baseline(file_name: str, rows: int) -> dict:
+    try:
+        with open(file_name, encoding="utf-8") as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        return {}
+    return baseline["stages"] if baseline.get("rows") == rows else {}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vacancy pipeline on generated data")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.8)
+    args = parser.parse_args()
+    baseline = load_baseline(args.baseline, args.rows)
+    results, regressions = {}, []
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = os.path.join(tmp, "vacancies.csv")
+        start = time.perf_counter()
+        write_vacancies(file_name, args.rows, args.seed)
+        write_valutes(os.path.join(tmp, "valutes.csv"))
+        print(f"generated {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+        for name in args.stages:
+            results[name] = result = run_isolated(name, file_name, args.rows, tmp, args.repeat)
+            line = f"{name:34} {result['rows_per_sec']:>12,} rows/s {result['peak_rss_mb']:>9,.1f} MB peak"
+            if name in baseline:
+                ratio = result["rows_per_sec"] / baseline[name]["rows_per_sec"]
+                line += f"   {ratio:.2f}x baseline"
+                if ratio < args.tolerance:
+                    regressions.append(name)
+                    line += " REGRESSION"
+            print(line)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"rows": args.rows, "seed": args.seed, "python": sys.version.split()[0], "stages": results},
+                      file, indent=2, ensure_ascii=False)
+            file.write("\n")
+    if regressions:
+        sys.exit(1)
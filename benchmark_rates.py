@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+import time
+from rates_cache import RatesCache
+from stub_cbr_server import StubCbrServer
+from task_342 import GetValutesValues
+
+CURRENCIES = ["USD", "KZT", "BYR", "UAH", "EUR"]
+
+def run(server: StubCbrServer, cache_file: str, dates: list, bulk: bool) -> tuple:
+    valutes = GetValutesValues(CURRENCIES, RatesCache(cache_file), base_url=server.url)
+    server.requests.clear()
+    start = time.perf_counter()
+    rows = valutes.get_many_valutes(dates) if bulk else [valutes.get_valutes(date) for date in dates]
+    return time.perf_counter() - start, sum(server.requests.values()), rows
+
+if __name__ == "__main__":
+    start, end = (sys.argv[1], sys.argv[2]) if len(sys.argv) > 2 else ("2003-01", "2022-07")
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+    dates = GetValutesValues.get_date(start, end)
+    with tempfile.TemporaryDirectory() as tmp, StubCbrServer(latency=latency) as server:
+        daily_time, daily_requests, daily_rows = run(server, os.path.join(tmp, "daily.sqlite"), dates, False)
+        bulk_time, bulk_requests, bulk_rows = run(server, os.path.join(tmp, "bulk.sqlite"), dates, True)
+        assert bulk_rows == daily_rows
+        cached_time, cached_requests, cached_rows = run(server, os.path.join(tmp, "daily.sqlite"), dates, True)
+        assert cached_rows == daily_rows and cached_requests == 0
+    print(f"{len(dates)} months x {len(CURRENCIES)} currencies, {latency * 1000:.0f} ms latency: "
+          f"XML_daily {daily_requests} requests {daily_time:.2f}s, "
+          f"XML_dynamic {bulk_requests} requests {bulk_time:.2f}s ({daily_time / bulk_time:.1f}x), "
+          f"cached {cached_requests} requests {cached_time:.3f}s")
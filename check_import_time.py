@@ -0,0 +1,47 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+REPO_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ["pandas", "matplotlib", "openpyxl", "jinja2", "pdfkit", "xlsx2html", "requests"]
+IMPORT_HEAVY_MODULES = HEAVY_MODULES + ["numpy"]
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def get_import_times(args: List[str], cwd: str) -> Dict[str, int]:
+    env = dict(os.environ, PYTHONPATH=REPO_DIRECTORY)
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for match in IMPORT_LINE.finditer(result.stderr):
+        times.setdefault(match.group(4), int(match.group(2)))
+    return times
+
+def check_modules(times: Dict[str, int], forbidden: List[str]) -> List[str]:
+    return [module for module in times if module.split(".")[0] in forbidden]
+
+if __name__ == "__main__":
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 300
+    failures = []
+    times = get_import_times(["-c", "import task_342"], REPO_DIRECTORY)
+    import_ms = times["task_342"] / 1000
+    print(f"import task_342: {import_ms:,.1f} ms (budget {budget_ms:,.0f} ms)")
+    if import_ms > budget_ms:
+        failures.append(f"import task_342 took {import_ms:,.1f} ms")
+    failures += [f"import task_342 loaded {module}" for module in check_modules(times, IMPORT_HEAVY_MODULES)]
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "vacancies.csv"), "w", encoding="utf-8") as file:
+            file.write("name,salary_from,salary_to,salary_currency,area_name,published_at\n"
+                       "Программист,100000,150000,RUR,Москва,2022-07-01T10:00:00+0300\n"
+                       "Аналитик,2000,,USD,Минск,2022-07-02T10:00:00+0300\n")
+        with open(os.path.join(tmp, "valutes.csv"), "w", encoding="utf-8") as file:
+            file.write("date,USD\n07/2022,60.0\n")
+        times = get_import_times([os.path.join(REPO_DIRECTORY, "task_342.py"), "stats", "vacancies.csv", "Программист", "--json"], tmp)
+    loaded = check_modules(times, HEAVY_MODULES)
+    print(f"stats --json: {len(times)} modules imported, heavy: {', '.join(loaded) or 'none'}")
+    failures += [f"stats --json loaded {module}" for module in loaded]
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
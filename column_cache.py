@@ -0,0 +1,120 @@
+import array
+import functools
+import hashlib
+import json
+import os
+import shutil
+from typing import Iterator, List
+
+def get_file_digest(file_name: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_name, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def get_file_key(file_name: str, size: int, mtime_ns: int) -> str:
+    return f"{get_file_digest(file_name)[:32]}_{size}"
+
+class ColumnCache:
+    numeric_columns = ("salary_from", "salary_to")
+    prefix_columns = {"published_at": 7}
+
+    def __init__(self, file_name: str, directory: str = "vacancies_cache", chunk_size: int = 65536):
+        self.file_name = file_name
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.path = os.path.join(directory, self.get_key(file_name))
+
+    @staticmethod
+    def get_key(file_name: str) -> str:
+        stat = os.stat(file_name)
+        return get_file_key(os.path.abspath(file_name), stat.st_size, stat.st_mtime_ns)
+
+    def get_meta(self) -> dict or None:
+        try:
+            with open(os.path.join(self.path, "meta.json"), encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def is_complete(self) -> bool:
+        return self.get_meta() is not None
+
+    def get_parts(self) -> List[tuple]:
+        return [(self, index) for index in range(self.get_meta()["parts"])]
+
+    def get_column_file(self, index: int, column: str, kind: str) -> str:
+        return os.path.join(self.path, f"part-{index:04d}.{column}.{kind}.npy")
+
+    def record(self, index: int, columns: List[str], rows: Iterator[List[str]]) -> Iterator[List[str]]:
+        import numpy as np
+        values = {column: array.array("d") if column in self.numeric_columns else array.array("i") for column in columns}
+        dictionaries = {column: {} for column in columns if column not in self.numeric_columns}
+        for row in rows:
+            for column, value in zip(columns, row):
+                if column in self.numeric_columns:
+                    values[column].append(float(value) if value != "" else 0)
+                else:
+                    dictionary = dictionaries[column]
+                    value = value[:self.prefix_columns[column]] if column in self.prefix_columns else value
+                    code = dictionary.get(value)
+                    if code is None:
+                        code = dictionary[value] = len(dictionary)
+                    values[column].append(code)
+            yield row
+        os.makedirs(self.path, exist_ok=True)
+        for column in columns:
+            if column in self.numeric_columns:
+                self.save_array(self.get_column_file(index, column, "values"), np.frombuffer(values[column], dtype=np.float64))
+                continue
+            self.save_array(self.get_column_file(index, column, "codes"), np.frombuffer(values[column], dtype=np.int32))
+            encoded = [value.encode("utf-8") for value in dictionaries[column]]
+            self.save_array(self.get_column_file(index, column, "data"), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+            self.save_array(self.get_column_file(index, column, "offsets"),
+                            np.cumsum([0] + [len(value) for value in encoded], dtype=np.int64))
+
+    @staticmethod
+    def save_array(file_name: str, values: 'np.ndarray') -> None:
+        import numpy as np
+        with open(file_name + ".tmp", "wb") as file:
+            np.save(file, values)
+        os.replace(file_name + ".tmp", file_name)
+
+    def commit(self, parts: int, columns: List[str]) -> None:
+        with open(os.path.join(self.path, "meta.json.tmp"), "w", encoding="utf-8") as file:
+            json.dump({"file_name": os.path.abspath(self.file_name), "parts": parts, "columns": columns}, file)
+        os.replace(os.path.join(self.path, "meta.json.tmp"), os.path.join(self.path, "meta.json"))
+        self.remove_stale()
+
+    def remove_stale(self) -> None:
+        for entry in os.scandir(self.directory):
+            if entry.path == self.path or not entry.is_dir():
+                continue
+            try:
+                with open(os.path.join(entry.path, "meta.json"), encoding="utf-8") as file:
+                    stale = json.load(file)["file_name"] == os.path.abspath(self.file_name)
+            except (FileNotFoundError, ValueError, KeyError):
+                continue
+            if stale:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def load_column(self, index: int, column: str) -> tuple:
+        import numpy as np
+        if column in self.numeric_columns:
+            return np.load(self.get_column_file(index, column, "values"), mmap_mode="r"), None
+        data = np.load(self.get_column_file(index, column, "data")).tobytes()
+        offsets = np.load(self.get_column_file(index, column, "offsets")).tolist()
+        dictionary = [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+        return np.load(self.get_column_file(index, column, "codes"), mmap_mode="r"), dictionary
+
+    def iter_rows(self, index: int, columns: List[str]) -> Iterator[tuple]:
+        loaded = [self.load_column(index, column) for column in columns]
+        count = len(loaded[0][0]) if loaded else 0
+        for start in range(0, count, self.chunk_size):
+            chunk = []
+            for values, dictionary in loaded:
+                values = values[start:start + self.chunk_size].tolist()
+                chunk.append(values if dictionary is None else [dictionary[code] for code in values])
+            yield from zip(*chunk)
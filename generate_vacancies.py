@@ -0,0 +1,65 @@
+import csv
+import sys
+from typing import Iterator, List
+import numpy as np
+
+COLUMNS = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+PROFESSIONS = ["Программист", "Python developer", "Java-разработчик", "Аналитик", "Системный администратор",
+               "Тестировщик", "Менеджер по продажам", "Бухгалтер", "Инженер", "Специалист технической поддержки",
+               "Frontend-разработчик", "Водитель", "Оператор call-центра", "Дизайнер", "Product Manager"]
+PREFIXES = ["", "", "", "Младший ", "Старший ", "Ведущий ", "Главный "]
+SUFFIXES = ["", "", "", " (удаленно)", " в офис", " / Junior", " (1С)", " со знанием английского"]
+HTML_TEMPLATES = ["{}", "{}", "{}", "{}", "{}", "{}", "<strong>{}</strong>", "<p>{}</p>\n", "{} <br/>  ", "<em>  {}</em>"]
+AREAS = ["Москва", "Санкт-Петербург", "Минск", "Алматы", "Новосибирск", "Екатеринбург", "Казань", "Нур-Султан",
+         "Краснодар", "Нижний Новгород", "Киев", "Ташкент", "Самара", "Ростов-на-Дону", "Воронеж"]
+AREA_WEIGHTS = [0.3, 0.14, 0.08, 0.07, 0.05, 0.05, 0.05, 0.04, 0.04, 0.04, 0.04, 0.03, 0.03, 0.02, 0.02]
+CURRENCIES = ["RUR", "USD", "KZT", "BYR", "UAH", "EUR", "UZS", "GBP"]
+CURRENCY_WEIGHTS = [0.74, 0.06, 0.06, 0.05, 0.04, 0.03, 0.015, 0.005]
+CURRENCY_SCALES = [1, 0.015, 5, 0.035, 0.4, 0.014, 120, 0.012]
+FIRST_PUBLISHED = np.datetime64("2003-01-01T00:00:00", "s")
+LAST_PUBLISHED = np.datetime64("2022-08-01T00:00:00", "s")
+
+def generate_chunk(rng: np.random.Generator, rows: int) -> List[list]:
+    professions = rng.integers(0, len(PROFESSIONS), rows)
+    prefixes = rng.integers(0, len(PREFIXES), rows)
+    suffixes = rng.integers(0, len(SUFFIXES), rows)
+    templates = rng.integers(0, len(HTML_TEMPLATES), rows)
+    areas = rng.choice(len(AREAS), rows, p=AREA_WEIGHTS)
+    currencies = rng.choice(len(CURRENCIES), rows, p=CURRENCY_WEIGHTS)
+    salary_from = np.round(rng.lognormal(11, 0.5, rows) * np.take(CURRENCY_SCALES, currencies), -2)
+    salary_to = np.round(salary_from * rng.uniform(1, 1.8, rows), -2)
+    missing = rng.random(rows)
+    seconds = rng.integers(FIRST_PUBLISHED.astype(np.int64), LAST_PUBLISHED.astype(np.int64), rows).astype("datetime64[s]")
+    published_at = np.datetime_as_string(seconds, unit="s")
+    chunk = []
+    for i in range(rows):
+        name = HTML_TEMPLATES[templates[i]].format(PREFIXES[prefixes[i]] + PROFESSIONS[professions[i]] + SUFFIXES[suffixes[i]])
+        low, high = f"{salary_from[i]:.1f}", f"{salary_to[i]:.1f}"
+        if missing[i] < 0.03:
+            low = high = currency = ""
+        else:
+            currency = CURRENCIES[currencies[i]]
+            if missing[i] < 0.3:
+                low = ""
+            elif missing[i] < 0.6:
+                high = ""
+        chunk.append([name, low, high, currency, AREAS[areas[i]], f"{published_at[i]}+0300"])
+    return chunk
+
+def generate_rows(rows: int, seed: int = 0, chunk_rows: int = 100000) -> Iterator[list]:
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        yield from generate_chunk(rng, min(chunk_rows, rows - start))
+
+def write_vacancies(file_name: str, rows: int, seed: int = 0) -> int:
+    with open(file_name, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        writer.writerows(generate_rows(rows, seed))
+    return rows
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else "vacancies_generated.csv"
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    write_vacancies(output, rows, seed)
@@ -0,0 +1,181 @@
+import contextlib
+import json
+import os
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+def get_peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def get_children_peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+def subtract_counters(after: Dict[str, int], before: Dict[str, int]) -> Dict[str, int]:
+    return {name: value - before.get(name, 0) for name, value in after.items() if value != before.get(name, 0)}
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.profile_stage = None
+        self.profile_output = None
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.workers = []
+        self.caches = {}
+        self.cache_baseline = {}
+        self.profiles = []
+
+    def enable(self, profile_stage: str = None, profile_output: str = None) -> None:
+        self.enabled = True
+        self.profile_stage = profile_stage
+        self.profile_output = profile_output or f"{profile_stage}.prof"
+        self.started = time.perf_counter()
+        self.cache_baseline = self.get_cache_counters()
+
+    def watch_cache(self, name: str, function: Callable) -> None:
+        self.caches[name] = function
+
+    def get_cache_counters(self) -> Dict[str, int]:
+        counters = {}
+        for name, function in self.caches.items():
+            info = function.cache_info()
+            counters[f"{name}_hits"], counters[f"{name}_misses"] = info.hits, info.misses
+        return counters
+
+    def count(self, name: str, value: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_counters(self, counters: Dict[str, int]) -> None:
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return NULL_STAGE
+        return self.timed_stage(name)
+
+    @contextlib.contextmanager
+    def timed_stage(self, name: str) -> Iterator[None]:
+        profiler = self.create_profiler() if name == self.profile_stage else None
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profiles.append(self.dump_profile(profiler, self.profile_output))
+            stage = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+            stage["calls"] += 1
+            stage["seconds"] += time.perf_counter() - start
+
+    @staticmethod
+    def create_profiler():
+        import cProfile
+        return cProfile.Profile()
+
+    @staticmethod
+    def dump_profile(profiler, profile_output: str) -> str:
+        file_name = f"{profile_output}.{os.getpid()}.{time.perf_counter_ns()}"
+        profiler.dump_stats(file_name)
+        return file_name
+
+    def map(self, executor, function: Callable, values: Iterable, stage: str) -> Iterator[Any]:
+        if not self.enabled:
+            return executor.map(function, values)
+        profile_output = self.profile_output if stage == self.profile_stage else None
+        return self.collect(executor.map(WorkerTask(function, stage, profile_output), values))
+
+    def collect(self, results: Iterator[tuple]) -> Iterator[Any]:
+        for result, worker in results:
+            self.add_counters(worker.pop("counters"))
+            profile = worker.pop("profile")
+            if profile is not None:
+                self.profiles.append(profile)
+            self.workers.append(worker)
+            yield result
+
+    def get_worker_summary(self) -> Dict[str, dict]:
+        summary = {}
+        for worker in self.workers:
+            stage = summary.setdefault(worker["stage"], {"tasks": 0, "seconds": 0.0, "max_seconds": 0.0, "pids": set()})
+            stage["tasks"] += 1
+            stage["seconds"] += worker["seconds"]
+            stage["max_seconds"] = max(stage["max_seconds"], worker["seconds"])
+            stage["pids"].add(worker["pid"])
+        return {name: {"tasks": stage["tasks"], "workers": len(stage["pids"]), "seconds": round(stage["seconds"], 4),
+                       "max_seconds": round(stage["max_seconds"], 4)} for name, stage in summary.items()}
+
+    def to_dict(self) -> dict:
+        counters = dict(self.counters)
+        for name, value in subtract_counters(self.get_cache_counters(), self.cache_baseline).items():
+            counters[name] = counters.get(name, 0) + value
+        return {"argv": sys.argv,
+                "wall_seconds": round(time.perf_counter() - self.started, 4),
+                "peak_rss_mb": round(get_peak_rss_mb(), 1),
+                "children_peak_rss_mb": round(get_children_peak_rss_mb(), 1),
+                "stages": {name: {"calls": stage["calls"], "seconds": round(stage["seconds"], 4)}
+                           for name, stage in self.stages.items()},
+                "counters": dict(sorted(counters.items())),
+                "worker_stages": self.get_worker_summary(),
+                "workers": self.workers}
+
+    def save_profile(self) -> str or None:
+        if not self.profiles:
+            return None
+        import pstats
+        pstats.Stats(*self.profiles).dump_stats(self.profile_output)
+        for file_name in self.profiles:
+            os.remove(file_name)
+        self.profiles = []
+        return self.profile_output
+
+    def save(self, file_name: str = None) -> None:
+        self.save_profile()
+        if file_name is None:
+            return
+        with open(file_name + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+            file.write("\n")
+        os.replace(file_name + ".tmp", file_name)
+
+class WorkerTask:
+    def __init__(self, function: Callable, stage: str, profile_output: str = None):
+        self.function = function
+        self.stage = stage
+        self.profile_output = profile_output
+
+    def __call__(self, value: Any) -> tuple:
+        METRICS.enabled = True
+        counters, caches = dict(METRICS.counters), METRICS.get_cache_counters()
+        profiler = Metrics.create_profiler() if self.profile_output is not None else None
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = self.function(value)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        seconds = time.perf_counter() - start
+        worker_counters = subtract_counters(METRICS.counters, counters)
+        for name, delta in subtract_counters(METRICS.get_cache_counters(), caches).items():
+            worker_counters[name] = worker_counters.get(name, 0) + delta
+        return result, {"stage": self.stage, "pid": os.getpid(), "seconds": round(seconds, 4),
+                        "peak_rss_mb": round(get_peak_rss_mb(), 1), "counters": worker_counters,
+                        "profile": Metrics.dump_profile(profiler, self.profile_output) if profiler is not None else None}
+
+NULL_STAGE = contextlib.nullcontext()
+METRICS = Metrics()
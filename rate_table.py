@@ -0,0 +1,96 @@
+import csv
+import functools
+import hashlib
+import math
+import os
+from typing import List
+
+def month_key(date: str) -> int:
+    if date[2] == '/':
+        return int(date[3:7]) * 12 + int(date[:2])
+    return int(date[:4]) * 12 + int(date[5:7])
+
+def month_keys(dates: 'pd.Series') -> 'np.ndarray':
+    import numpy as np
+    dates = dates.astype(str)
+    if len(dates) and dates.iat[0][2:3] == '/':
+        return (dates.str[3:7].astype(np.int64) * 12 + dates.str[:2].astype(np.int64)).to_numpy()
+    return (dates.str[:4].astype(np.int64) * 12 + dates.str[5:7].astype(np.int64)).to_numpy()
+
+class RateTable:
+    def __init__(self, currencies: List[str], first_key: int, last_key: int):
+        import numpy as np
+        self.currencies = list(currencies)
+        self.columns = {currency: i for i, currency in enumerate(self.currencies)}
+        self.first_key = first_key
+        self.last_key = last_key
+        self.rates = np.full((last_key - first_key + 1, len(self.currencies)), np.nan)
+        if 'RUR' in self.columns:
+            self.rates[:, self.columns['RUR']] = 1
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame', date_column: str = 'date') -> 'RateTable':
+        currencies = [c for c in df.columns if c != date_column and not c.startswith('Unnamed')]
+        keys = month_keys(df[date_column])
+        table = cls(currencies, int(keys.min()), int(keys.max()))
+        table.rates[keys - table.first_key] = df[currencies].to_numpy(dtype=float)
+        return table
+
+    @classmethod
+    def from_csv(cls, file_name: str, date_column: str = 'date') -> 'RateTable':
+        import numpy as np
+        with open(file_name, encoding='utf-8-sig', newline='') as file:
+            reader = csv.reader(file)
+            headlines = next(reader)
+            rows = [row for row in reader if row]
+        date_index = headlines.index(date_column)
+        columns = [i for i, c in enumerate(headlines) if i != date_index and c and not c.startswith('Unnamed')]
+        keys = np.array([month_key(row[date_index]) for row in rows], dtype=np.int64)
+        table = cls([headlines[i] for i in columns], int(keys.min()), int(keys.max()))
+        table.rates[keys - table.first_key] = [[float(row[i]) if row[i] != '' else np.nan for i in columns] for row in rows]
+        return table
+
+    @property
+    def version(self) -> str:
+        import numpy as np
+        digest = hashlib.sha256(",".join(self.currencies).encode())
+        digest.update(f"{self.first_key}:{self.last_key}".encode())
+        digest.update(np.ascontiguousarray(self.rates).tobytes())
+        return digest.hexdigest()
+
+    def set(self, key: int, currency: str, value: float) -> None:
+        self.rates[key - self.first_key, self.columns[currency]] = value
+
+    def get(self, key: int, currency: str, default: float = math.nan) -> float:
+        column = self.columns.get(currency)
+        if column is None:
+            return default
+        if not self.first_key <= key <= self.last_key:
+            return default
+        return self.rates[key - self.first_key, column]
+
+    def multipliers(self, month_keys: 'np.ndarray', currencies: 'np.ndarray', default: float = math.nan) -> 'np.ndarray':
+        import numpy as np
+        month_keys = np.asarray(month_keys, dtype=np.int64)
+        codes, inverse = np.unique(np.asarray(currencies, dtype=object).astype(str), return_inverse=True)
+        columns = np.array([self.columns.get(code, -1) for code in codes], dtype=np.int64)[inverse.ravel()]
+        rows = month_keys - self.first_key
+        in_range = (rows >= 0) & (rows < len(self.rates))
+        result = np.full(len(month_keys), np.nan)
+        found = in_range & (columns >= 0)
+        result[found] = self.rates[rows[found], columns[found]]
+        result[~found] = default
+        return result
+
+    def convert(self, amounts: 'np.ndarray', month_keys: 'np.ndarray', currencies: 'np.ndarray',
+                default: float = math.nan) -> 'np.ndarray':
+        import numpy as np
+        return np.asarray(amounts, dtype=float) * self.multipliers(month_keys, currencies, default)
+
+def load_rate_table(file_name: str = 'valutes.csv', date_column: str = 'date') -> RateTable:
+    stat = os.stat(file_name)
+    return read_rate_table(os.path.abspath(file_name), date_column, stat.st_size, stat.st_mtime_ns)
+
+@functools.lru_cache(maxsize=None)
+def read_rate_table(file_name: str, date_column: str, size: int, mtime_ns: int) -> RateTable:
+    return RateTable.from_csv(file_name, date_column)
@@ -0,0 +1,117 @@
+import datetime
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Callable, Dict, Iterator, List
+
+def parse_daily_rates(content: bytes) -> Dict[str, float]:
+    rates = {}
+    for valute in ET.fromstring(content).iter('Valute'):
+        value = float(valute.findtext('Value').replace(',', '.'))
+        nominal = float(valute.findtext('Nominal').replace(',', '.'))
+        rates[valute.findtext('CharCode')] = value / nominal
+    return rates
+
+def parse_valute_ids(content: bytes) -> Dict[str, str]:
+    ids = {}
+    for item in ET.fromstring(content).iter('Item'):
+        char_code = (item.findtext('ISO_Char_Code') or '').strip()
+        if char_code:
+            ids.setdefault(char_code, item.get('ID'))
+    return ids
+
+def parse_dynamic_rates(file: BinaryIO) -> Iterator[tuple]:
+    for _, record in ET.iterparse(file):
+        if record.tag != 'Record':
+            continue
+        value = float(record.findtext('Value').replace(',', '.'))
+        nominal = float(record.findtext('Nominal').replace(',', '.'))
+        yield datetime.datetime.strptime(record.get('Date'), '%d.%m.%Y').date(), value / nominal
+        record.clear()
+
+class RatesCache:
+    def __init__(self, file_name: str = 'rates_cache.sqlite', retry_after: float = 60) -> None:
+        self.file_name = file_name
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(file_name, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS rates (date TEXT, char_code TEXT, rate REAL,
+                                              PRIMARY KEY (date, char_code)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS fetches (date TEXT PRIMARY KEY, status TEXT, attempts INTEGER,
+                                                fetched_at TEXT, updated REAL);
+        ''')
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def is_fresh(self, date: str, status: str, fetched_at: str, updated: float) -> bool:
+        if status == 'ok':
+            return fetched_at > date
+        return time.time() - updated < self.retry_after
+
+    def get_many(self, dates: List[str]) -> Dict[str, Dict[str, float] or None]:
+        if not dates:
+            return {}
+        bounds = (min(dates), max(dates))
+        wanted = set(dates)
+        with self.lock:
+            fetches = self.conn.execute('SELECT date, status, fetched_at, updated FROM fetches '
+                                        'WHERE date BETWEEN ? AND ?', bounds).fetchall()
+            rates = self.conn.execute('SELECT date, char_code, rate FROM rates WHERE date BETWEEN ? AND ?',
+                                      bounds).fetchall()
+        result = {row[0]: {} if row[1] == 'ok' else None
+                  for row in fetches if row[0] in wanted and self.is_fresh(*row)}
+        for date, char_code, rate in rates:
+            if result.get(date) is not None:
+                result[date][char_code] = rate
+        return result
+
+    def get_stale(self, date: str) -> Dict[str, float] or None:
+        with self.lock:
+            rates = self.conn.execute('SELECT char_code, rate FROM rates WHERE date = ?', (date,)).fetchall()
+        return dict(rates) or None
+
+    def get(self, date: str) -> Dict[str, float] or None:
+        return self.get_many([date]).get(date, False) or None
+
+    def missing(self, dates: List[str]) -> List[str]:
+        cached = self.get_many(dates)
+        return [date for date in dates if date not in cached]
+
+    def last_date(self) -> str or None:
+        with self.lock:
+            return self.conn.execute("SELECT max(date) FROM fetches WHERE status = 'ok'").fetchone()[0]
+
+    def put(self, date: str, rates: Dict[str, float]) -> None:
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM rates WHERE date = ?', (date,))
+            self.conn.executemany('INSERT INTO rates VALUES (?, ?, ?)',
+                                  [(date, char_code, rate) for char_code, rate in rates.items()])
+            self.conn.execute("INSERT INTO fetches VALUES (?, 'ok', 1, ?, ?) ON CONFLICT(date) DO UPDATE SET "
+                              "status = 'ok', attempts = attempts + 1, fetched_at = excluded.fetched_at, "
+                              "updated = excluded.updated",
+                              (date, datetime.date.today().isoformat(), time.time()))
+
+    def mark_failed(self, date: str) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO fetches VALUES (?, 'failed', 1, NULL, ?) ON CONFLICT(date) DO UPDATE SET "
+                              "status = 'failed', attempts = attempts + 1, updated = excluded.updated "
+                              "WHERE status != 'ok'",
+                              (date, time.time()))
+
+    def read_through(self, date: str, fetch: Callable[[], Dict[str, float]]) -> Dict[str, float] or None:
+        cached = self.get_many([date])
+        if date in cached:
+            return cached[date] if cached[date] is not None else self.get_stale(date)
+        try:
+            rates = fetch()
+        except Exception:
+            rates = None
+        if not rates:
+            self.mark_failed(date)
+            return self.get_stale(date)
+        self.put(date, rates)
+        return rates
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Callable
+from metrics import METRICS
+
+class ResultCache:
+    def __init__(self, directory: str = "statistic_results", max_entries: int = 32):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.manifest_file = os.path.join(directory, "artifacts.json")
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_digest(value: Any) -> str:
+        return hashlib.sha256(pickle.dumps(value, protocol=4)).hexdigest()
+
+    def get_entry_file(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry_file = self.get_entry_file(key)
+        try:
+            with open(entry_file, "rb") as file:
+                value = pickle.load(file)
+        except (FileNotFoundError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+            return default
+        os.utime(entry_file)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        entry_file = self.get_entry_file(key)
+        with open(entry_file + ".tmp", "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(entry_file + ".tmp", entry_file)
+        self.evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        METRICS.count("result_cache_misses" if value is missing else "result_cache_hits")
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def evict(self) -> None:
+        entries = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith(".pickle")),
+                         key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+        for entry in entries[self.max_entries:]:
+            os.remove(entry.path)
+
+    def load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_file, encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def is_artifact_fresh(self, file_name: str, digest: str) -> bool:
+        artifact = self.load_manifest().get(os.path.abspath(file_name))
+        if artifact is None or artifact["digest"] != digest:
+            return False
+        try:
+            stat = os.stat(file_name)
+        except FileNotFoundError:
+            return False
+        return artifact["size"] == stat.st_size and artifact["mtime_ns"] == stat.st_mtime_ns
+
+    def mark_artifact(self, file_name: str, digest: str) -> None:
+        manifest = self.load_manifest()
+        stat = os.stat(file_name)
+        manifest[os.path.abspath(file_name)] = {"digest": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        with open(self.manifest_file + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False)
+        os.replace(self.manifest_file + ".tmp", self.manifest_file)
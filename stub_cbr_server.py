@@ -0,0 +1,111 @@
+import collections
+import datetime
+import http.server
+import threading
+import time
+import zlib
+from urllib.parse import urlparse, parse_qs
+
+STUB_VALUTES = {'USD': ('R01235', 1), 'KZT': ('R01335', 100), 'BYR': ('R01090', 1),
+                'UAH': ('R01720', 10), 'EUR': ('R01239', 1)}
+STUB_LAST_DATES = {'BYR': datetime.date(2016, 6, 30)}
+
+def parse_date(date: str) -> datetime.date:
+    return datetime.datetime.strptime(date.replace('.', '/'), '%d/%m/%Y').date()
+
+def get_rate_date(date: datetime.date) -> datetime.date:
+    return date - datetime.timedelta(days=max(date.weekday() - 4, 0))
+
+def is_quoted(char_code: str, date: datetime.date) -> bool:
+    return date <= STUB_LAST_DATES.get(char_code, datetime.date.max)
+
+def stub_value(char_code: str, date: str) -> str:
+    value = 10 + zlib.crc32(f'{char_code}{date}'.encode()) % 9000 / 100
+    return f'{value:.4f}'.replace('.', ',')
+
+def daily_xml(date: str) -> bytes:
+    rate_date = get_rate_date(parse_date(date))
+    quoted = rate_date.strftime('%d/%m/%Y')
+    valutes = ''.join(f'<Valute ID="{valute_id}"><NumCode>000</NumCode><CharCode>{char_code}</CharCode>'
+                      f'<Nominal>{nominal}</Nominal><Name>{char_code}</Name>'
+                      f'<Value>{stub_value(char_code, quoted)}</Value></Valute>'
+                      for char_code, (valute_id, nominal) in STUB_VALUTES.items() if is_quoted(char_code, rate_date))
+    return (f'<?xml version="1.0" encoding="windows-1251"?>'
+            f'<ValCurs Date="{rate_date:%d.%m.%Y}" name="Foreign Currency Market">{valutes}</ValCurs>'
+            ).encode('windows-1251')
+
+def dynamic_xml(first_date: str, last_date: str, valute_id: str) -> bytes:
+    char_code, nominal = next(((code, nominal) for code, (code_id, nominal) in STUB_VALUTES.items()
+                               if code_id == valute_id), (None, 1))
+    first, last = parse_date(first_date), parse_date(last_date)
+    records = []
+    for day in range((last - first).days + 1 if char_code is not None else 0):
+        date = first + datetime.timedelta(days=day)
+        if date.weekday() < 5 and is_quoted(char_code, date):
+            records.append(f'<Record Date="{date:%d.%m.%Y}" Id="{valute_id}"><Nominal>{nominal}</Nominal>'
+                           f'<Value>{stub_value(char_code, date.strftime("%d/%m/%Y"))}</Value></Record>')
+    return (f'<?xml version="1.0" encoding="windows-1251"?>'
+            f'<ValCurs ID="{valute_id}" DateRange1="{first:%d.%m.%Y}" DateRange2="{last:%d.%m.%Y}" '
+            f'name="Foreign Currency Market Dynamic">{"".join(records)}</ValCurs>').encode('windows-1251')
+
+def valutes_xml(daily: str) -> bytes:
+    items = ''.join(f'<Item ID="{valute_id}"><Name>{char_code}</Name><EngName>{char_code}</EngName>'
+                    f'<Nominal>{nominal}</Nominal><ParentCode>{valute_id}    </ParentCode>'
+                    f'<ISO_Num_Code>0</ISO_Num_Code><ISO_Char_Code>{char_code}</ISO_Char_Code></Item>'
+                    for char_code, (valute_id, nominal) in STUB_VALUTES.items() if daily == '0')
+    return (f'<?xml version="1.0" encoding="windows-1251"?>'
+            f'<Valuta name="Foreign Currency Market Lib">{items}</Valuta>').encode('windows-1251')
+
+class StubCbrHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        time.sleep(self.latency)
+        with self.server.lock:
+            self.server.requests[url.path.rsplit('/', 1)[-1]] += 1
+        if url.path.endswith('XML_daily.asp'):
+            self.send_body(daily_xml(query.get('date_req', ['01/01/2003'])[0]))
+        elif url.path.endswith('XML_dynamic.asp'):
+            self.send_body(dynamic_xml(query['date_req1'][0], query['date_req2'][0], query['VAL_NM_RQ'][0]))
+        elif url.path.endswith('XML_val.asp'):
+            self.send_body(valutes_xml(query.get('d', ['0'])[0]))
+        else:
+            self.send_error(404)
+
+    def send_body(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml; charset=windows-1251')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+class StubCbrServer:
+    def __init__(self, latency: float = 0.0) -> None:
+        handler = type('Handler', (StubCbrHandler,), {'latency': latency})
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = collections.Counter()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> collections.Counter:
+        return self.server.requests
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_address[1]}/scripts'
+
+    def __enter__(self) -> 'StubCbrServer':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
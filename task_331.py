@@ -1,32 +1,85 @@
+import concurrent.futures
 import pandas as pd
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+from rates_cache import RatesCache, parse_daily_rates
+from rate_table import RateTable
+
+CBR_DAILY_URL = 'https://www.cbr.ru/scripts/XML_daily.asp'
 
 class ProcessCurrencies:
-    def __init__(self, file_name: str) -> None:
+    def __init__(self, file_name: str, base_url: str = CBR_DAILY_URL, max_workers: int = 8,
+                 timeout: float = 10, retries: int = 3, backoff_factor: float = 0.5,
+                 cache_file: str or None = 'rates_cache.sqlite') -> None:
         self.__file_name = file_name
         self.df = pd.read_csv(file_name)
         self.min_date = self.df['published_at'].min()
         self.max_date = self.df['published_at'].max()
         self.currencies_to_convert = None
         self.__currencies_data = None
+        self.rate_table = None
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.session = None
+        self.cache = RatesCache(cache_file) if cache_file is not None else None
+
+    def create_session(self) -> requests.Session:
+        session = requests.Session()
+        retry = Retry(total=self.retries, backoff_factor=self.backoff_factor,
+                      status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.max_workers, 1), max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
 
-    def generate_currency(self, start_date: str, finish_date: str) -> None:
+    def get_months(self, start_date: str, finish_date: str) -> list:
         first_year = int(start_date[:4])
         first_month = int(start_date[5:7])
         last_year = int(finish_date[:4])
         last_month = int(finish_date[5:7])
-        dataf = pd.DataFrame(columns=['date'] + self.currencies_to_convert)
+        months = []
         for year in range(first_year, last_year + 1):
             for month in range(1, 13):
                 if (year == first_year and month < first_month) or (year == last_year and month > last_month):
                     continue
-                row = self.create_row(month, year)
-                if row is None:
-                    continue
-                dataf.loc[len(dataf.index)] = row
+                months.append((month, year))
+        return months
+
+    def fetch_rows(self, months: list) -> list:
+        cached = {}
+        if self.cache is not None:
+            cached = self.cache.get_many([self.get_date(month, year) for month, year in months])
+        missing = [date for date in months if self.get_date(*date) not in cached]
+        if missing and self.session is None:
+            self.session = self.create_session()
+        if self.max_workers <= 1 or len(missing) <= 1:
+            fetched = [self.create_row(month, year) for month, year in missing]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                fetched = list(executor.map(lambda date: self.create_row(*date), missing))
+        fetched = dict(zip(missing, fetched))
+        return [fetched[(month, year)] if (month, year) in fetched
+                else self.build_row(month, year, cached[self.get_date(month, year)]) for month, year in months]
+
+    def get_date(self, month: int, year: int) -> str:
+        return f'{year}-{month:02}-02'
+
+    def fetch_rates(self, url: str) -> dict:
+        session = self.session if self.session is not None else requests
+        res = session.get(url, timeout=self.timeout)
+        res.raise_for_status()
+        return parse_daily_rates(res.content)
+
+    def generate_currency(self, start_date: str, finish_date: str, output: str = 'dataframe331.csv') -> None:
+        rows = [row for row in self.fetch_rows(self.get_months(start_date, finish_date)) if row is not None]
+        dataf = pd.DataFrame(rows, columns=['date'] + self.currencies_to_convert)
         self.__currencies_data = dataf
-        dataf.to_csv('dataframe331.csv')
+        self.rate_table = RateTable.from_dataframe(dataf) if rows else None
+        dataf.to_csv(output)
 
     def create_currencies_to_convert(self, n = 5000) -> list:
         curr_convert = []
@@ -41,27 +94,29 @@ class ProcessCurrencies:
     def create_row(self, month: str, year: str) -> list or None:
         try:
             format_month = ('0' + str(month))[-2:]
-            url = f'https://www.cbr.ru/scripts/XML_daily.asp?date_req=02/{format_month}/{year}'
-            res = requests.get(url)
-            tree = ET.fromstring(res.content)
-            row = [f'{year}-{format_month}']
-            for value in self.currencies_to_convert:
-                if value == 'RUR':
-                    row.append(1)
-                    continue
-                value_found = False
-                for valute in tree:
-                    if valute[1].text == value:
-                        row.append(round(float(valute[4].text.replace(',', '.'))
-                                         / float(valute[2].text.replace(',', '.')), 6))
-                        value_found = True
-                        break
-                if not value_found:
-                    row.append(None)
-            return row
+            url = f'{self.base_url}?date_req=02/{format_month}/{year}'
+            if self.cache is None:
+                rates = self.fetch_rates(url)
+            else:
+                rates = self.cache.read_through(self.get_date(int(month), int(year)), lambda: self.fetch_rates(url))
+            return self.build_row(month, year, rates)
         except Exception:
             return None
 
-result = ProcessCurrencies('vacancies_dif_currencies.csv')
-result.create_currencies_to_convert()
-result.generate_currency(result.min_date, result.max_date)
+    def build_row(self, month: str, year: str, rates: dict or None) -> list or None:
+        if rates is None:
+            return None
+        row = [f'{year}-{int(month):02}']
+        for value in self.currencies_to_convert:
+            if value == 'RUR':
+                row.append(1)
+            elif value in rates:
+                row.append(round(rates[value], 6))
+            else:
+                row.append(None)
+        return row
+
+if __name__ == "__main__":
+    result = ProcessCurrencies('vacancies_dif_currencies.csv')
+    result.create_currencies_to_convert()
+    result.generate_currency(result.min_date, result.max_date)
@@ -1,13 +1,22 @@
+import bz2
+import gzip
+import lzma
+import os
+import resource
+import time
+import numpy as np
 import pandas as pd
+from rate_table import RateTable, month_key, month_keys
 
 class ProcessSalaries:
-    def __init__(self, file_name: str) -> None:
+    def __init__(self, file_name: str, currencies_file: str = 'dataframe.csv') -> None:
         self.file_name = file_name
-        self.currencies = pd.read_csv('dataframe.csv')
+        self.currencies = pd.read_csv(currencies_file)
         self.available_currencies = list(self.currencies.keys()[2:])
+        self.rate_table = RateTable.from_dataframe(self.currencies)
 
     def get_nan_salary(self, row: pd.DataFrame) -> float or str:
-        salary_from, salary_to, salary_currency, published_at = str(row[0]), str(row[1]), str(row[2]), str(row[3])
+        salary_from, salary_to, salary_currency, published_at = str(row.iloc[0]), str(row.iloc[1]), str(row.iloc[2]), str(row.iloc[3])
         if salary_currency == 'nan':
             return 'nan'
         if salary_from != 'nan' and salary_to != 'nan':
@@ -19,16 +28,59 @@ class ProcessSalaries:
         else:
             return 'nan'
         if salary_currency != 'RUR' and salary_currency in self.available_currencies:
-            date = published_at[:7]
-            multiplier = self.currencies[self.currencies['date'] == date][salary_currency].iat[0]
-            salary *= multiplier
+            salary *= self.rate_table.get(month_key(published_at), salary_currency)
         return salary
 
-    def salaries_process(self) -> None:
+    def convert_salaries_rowwise(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        dataframe = dataframe.assign(salary=dataframe[['salary_from', 'salary_to', 'salary_currency', 'published_at']].apply(self.get_nan_salary, axis=1))
+        dataframe = dataframe.drop(labels=['salary_to', 'salary_from', 'salary_currency'], axis=1)
+        return dataframe.loc[dataframe['salary'] != 'nan']
+
+    def convert_salaries(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        salary_from = dataframe['salary_from'].astype(float)
+        salary_to = dataframe['salary_to'].astype(float)
+        currency = dataframe['salary_currency']
+        salary = salary_from.add(salary_to, fill_value=0).to_numpy(copy=True)
+        keep = currency.notna().to_numpy() & ~np.isnan(salary)
+        convert = keep & (currency.isin(self.available_currencies) & (currency != 'RUR')).to_numpy()
+        salary[convert] = self.rate_table.convert(salary[convert], month_keys(dataframe['published_at'][convert]),
+                                                  currency[convert].to_numpy())
+        dataframe = dataframe.drop(labels=['salary_to', 'salary_from', 'salary_currency'], axis=1)
+        dataframe['salary'] = salary
+        return dataframe.loc[keep]
+
+    def salaries_process(self, vectorized: bool = True) -> None:
         dataframe = pd.read_csv(self.file_name)
-        dataframe['salary'] = dataframe[['salary_from', 'salary_to', 'salary_currency', 'published_at']].apply(self.get_nan_salary, axis=1)
-        dataframe.drop(labels=['salary_to', 'salary_from', 'salary_currency'], axis = 1, inplace = True)
-        dataframe = dataframe.loc[dataframe['salary'] != 'nan']
+        if vectorized:
+            dataframe = self.convert_salaries(dataframe)
+        else:
+            dataframe = self.convert_salaries_rowwise(dataframe)
         dataframe.head(100).to_csv('conversion_pandas.csv', index = False)
 
-ProcessSalaries('vacancies_dif_currencies.csv').salaries_process()
\ No newline at end of file
+    def salaries_process_stream(self, output: str = 'conversion_pandas.csv', chunksize: int = 100000,
+                                columns: list = None, report: bool = False) -> int:
+        usecols = None
+        if columns is not None:
+            usecols = list(dict.fromkeys(list(columns) + ['salary_from', 'salary_to', 'salary_currency', 'published_at']))
+        opener = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}.get(os.path.splitext(output)[1], open)
+        start = time.perf_counter()
+        rows_read, rows_written = 0, 0
+        header = True
+        with opener(output, 'wt', encoding='utf-8', newline='') as file:
+            for chunk in pd.read_csv(self.file_name, chunksize=chunksize, usecols=usecols):
+                rows_read += len(chunk)
+                chunk = self.convert_salaries(chunk)
+                if columns is not None:
+                    chunk = chunk[[c for c in columns if c in chunk.columns] + ['salary']]
+                chunk.to_csv(file, index=False, header=header)
+                header = False
+                rows_written += len(chunk)
+        if report:
+            elapsed = time.perf_counter() - start
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f'{rows_read} rows read, {rows_written} written in {elapsed:.2f}s '
+                  f'({rows_read / elapsed:,.0f} rows/s), peak RSS {peak_rss:.1f} MiB')
+        return rows_written
+
+if __name__ == "__main__":
+    ProcessSalaries('vacancies_dif_currencies.csv').salaries_process()
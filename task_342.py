@@ -1,34 +1,40 @@
+import argparse
+import base64
+import collections
 import csv
+import datetime
+import hashlib
+import io
+import json
+import operator
 import os
 import pathlib
-from typing import List, Dict
+from typing import Callable, List, Dict, Iterable, Iterator
 import re
-import numpy as np
-import pandas as pd
-import openpyxl
-import requests
-from matplotlib import pyplot as plt
-from openpyxl.styles import Border, Side, Alignment, Font
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.worksheet import Worksheet
-from jinja2 import Environment, FileSystemLoader
-import pdfkit
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
-from xlsx2html import xlsx2html
-import time
+import sys
 import concurrent.futures
+import functools
+from rates_cache import RatesCache, parse_daily_rates, parse_dynamic_rates, parse_valute_ids
+from rate_table import RateTable, load_rate_table, month_key
+from accumulators import SalaryAccumulator
+from aho_corasick import AhoCorasick
+from aggregate import GroupBy
+from column_cache import ColumnCache, get_file_digest
+from result_cache import ResultCache
+from metrics import METRICS
 
 class Vacancy:
+    __slots__ = ("name", "salary", "area_name", "published_at", "year")
+
     def __init__(self, vacancy: Dict[str, str]):
         self.name = vacancy["name"]
         self.salary = Salary(salary_from=vacancy["salary_from"],
                              salary_to=vacancy["salary_to"],
                              salary_currency=vacancy["salary_currency"],
                              published_at=vacancy["published_at"])
-        self.area_name = vacancy["area_name"]
+        self.area_name = sys.intern(str(vacancy["area_name"]))
         self.published_at = vacancy["published_at"]
-        self.year = self.published_at[:4]
+        self.year = sys.intern(str(self.published_at[:4]))
 
     def get_array_vacancy(self) -> List[str]:
         return [self.name, self.salary.get_average_salary(), self.area_name, self.published_at]
@@ -48,32 +54,73 @@ class DataSet:
     def process_vacancies(self, headlines: List[str], vacancies: List[List[str]]) -> (List[Vacancy]):
         result = []
         for vacancy in vacancies:
-            vacancy = [" ".join(re.sub("<.*?>", "", value).replace('\n', '; ').split()) for value in vacancy]
+            vacancy = [self.clean_value(value) for value in vacancy]
             result.append(Vacancy({x: y for x, y in zip([r for r in headlines], [v for v in vacancy])}))
         return result
 
+    @staticmethod
+    def clean_value(value: str) -> str:
+        return " ".join(re.sub("<.*?>", "", value).replace('\n', '; ').split())
+
+    @staticmethod
+    def is_valid_row(vacancy: List[str], count_columns: int) -> bool:
+        return (len(vacancy) == count_columns) and ((all([v != "" for v in vacancy])) or (vacancy[1] == "" and vacancy[2] != "") or (vacancy[1] != "" and vacancy[2] == ""))
+
+    @staticmethod
+    def select_rows(file_reader, headlines: List[str], columns: List[str], only_valid: bool = False) -> Iterator[List[str]]:
+        indexes = [headlines.index(column) for column in columns]
+        parsed = dropped = 0
+        for row in file_reader:
+            if DataSet.is_valid_row(row, len(headlines)) if only_valid else len(row) == len(headlines):
+                parsed += 1
+                yield [DataSet.clean_value(row[i]) for i in indexes]
+            else:
+                dropped += 1
+        METRICS.count("rows_parsed", parsed)
+        METRICS.count("rows_dropped", dropped)
+
+    @staticmethod
+    def iter_rows(file_name: str, columns: List[str], only_valid: bool = False) -> Iterator[List[str]]:
+        with open(file_name, encoding='utf-8-sig') as file:
+            file_reader = csv.reader(file)
+            headlines = next(file_reader, [])
+            yield from DataSet.select_rows(file_reader, headlines, columns, only_valid)
+
+    @staticmethod
+    def iter_range_rows(file_name: str, headlines: List[str], start: int, end: int,
+                        columns: List[str]) -> Iterator[List[str]]:
+        with open(file_name, 'rb') as file:
+            file.seek(start)
+            data = file.read(end - start).decode('utf-8')
+        yield from DataSet.select_rows(csv.reader(io.StringIO(data, newline='')), headlines, columns, only_valid=True)
+
 class Salary:
+    __slots__ = ("salary_from", "salary_to", "salary_currency", "month_year")
+
     def __init__(self, salary_from: str or int or float, salary_to: str or int or float, salary_currency: str, published_at: str):
-        self.salary_from = self.check_void_value()
-        self.salary_to = self.check_void_value()
-        self.salary_currency = salary_currency
-        self.published_at = published_at
-        self.month_year = f"{self.published_at[5:7]}/{self.published_at[:4]}"
+        self.salary_from = self.check_void_value(salary_from)
+        self.salary_to = self.check_void_value(salary_to)
+        self.salary_currency = sys.intern(str(salary_currency))
+        self.month_year = sys.intern(f"{published_at[5:7]}/{published_at[:4]}")
 
+    @staticmethod
     def check_void_value(value: str or int or float) -> float:
         if type(value) == str and value == "":
             return 0
         return float(value)
 
     def get_average_salary(self):
-        return round(((self.salary_from + self.salary_to)
-                      * ProcessValutes(self.month_year, self.salary_currency).get_currency_valute()) / 2, 4)
+        return self.calculate_average(self.salary_from, self.salary_to, self.salary_currency, self.month_year)
+
+    @staticmethod
+    def calculate_average(salary_from: float, salary_to: float, salary_currency: str, month_year: str) -> float:
+        return round(((salary_from + salary_to) * get_currency_valute(month_year, salary_currency)) / 2, 4)
 
 
 class Report:
     def __init__(self, profession: str, years: List[int], average_salary: List[int],
                  average_salary_profession: List[int], count_vacancies_by_year: List[int],
-                 count_vacancies_by_year_prof: List[int], file_name: str):
+                 count_vacancies_by_year_prof: List[int], file_name: str, sheets: Dict[str, Iterable[list]] = None):
         self.years = years
         self.average_salary = average_salary
         self.average_salary_profession = average_salary_profession
@@ -81,125 +128,308 @@ class Report:
         self.count_vacancies_by_year_prof = count_vacancies_by_year_prof
         self.profession = profession
         self.file_name = file_name
+        self.sheets = sheets if sheets is not None else {}
 
-    def add_border_and_align(self, worksheet: Worksheet, side: Side, count_columns: int, rows: List[str]) -> None:
-        for i in range(1, count_columns):
-            for row in rows:
-                if i == 1:
-                    worksheet[row + str(i)].alignment = Alignment(horizontal='left')
-                    worksheet[row + str(i)].font = Font(bold=True)
-                if worksheet[row + str(i)].internal_value != None:
-                    worksheet[row + str(i)].border = Border(top=side, bottom=side, left=side, right=side)
-
-    def make_max_column_width(self, worksheet: Worksheet) -> None:
-        dims = {}
-        for row in worksheet.rows:
-            for cell in row:
-                if cell.value != None:
-                    dims[cell.column] = max((dims.get(cell.column, 0), len(str(cell.value))))
-                else:
-                    dims[cell.column] = len(str(cell.value))
-        for col, value in dims.items():
-            worksheet.column_dimensions[get_column_letter(col)].width = value + 2
+    def get_year_rows(self) -> Iterator[list]:
+        yield ["Год", "Средняя зарплата", f"Средняя зарплата - {self.profession}", "Количество вакансий", f"Количество вакансий - {self.profession}"]
+        for i in range(len(self.years)):
+            yield [self.years[i], self.average_salary[i], self.average_salary_profession[i], self.count_vacancies_by_year[i], self.count_vacancies_by_year_prof[i]]
+
+    @staticmethod
+    def get_sheet_title(title: str) -> str:
+        title = re.sub(r"[:\\/?*\[\]]", "", title).strip().strip("'")[:31].strip()
+        return title or "Лист"
+
+    @staticmethod
+    def add_named_styles(workbook) -> tuple:
+        from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+        side = Side(border_style="thin")
+        border = Border(top=side, bottom=side, left=side, right=side)
+        styles = (NamedStyle("report_header", font=Font(bold=True), border=border, alignment=Alignment(horizontal='left')),
+                  NamedStyle("report_cell", border=border))
+        for style in styles:
+            if style.name not in workbook.named_styles:
+                workbook.add_named_style(style)
+        return tuple(style.name for style in styles)
+
+    @staticmethod
+    def write_sheet(workbook, title: str, rows: Iterable[list]) -> None:
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+        header_style, cell_style = Report.add_named_styles(workbook)
+        worksheet = workbook.create_sheet(Report.get_sheet_title(title))
+        widths, cells = {}, []
+        for index, row in enumerate(rows):
+            row_cells = []
+            for column, value in enumerate(row):
+                cell = WriteOnlyCell(worksheet, value)
+                if index == 0:
+                    cell.style = header_style
+                if value is not None:
+                    if index != 0:
+                        cell.style = cell_style
+                    widths[column] = max(widths.get(column, 0), len(str(value)))
+                row_cells.append(cell)
+            cells.append(row_cells)
+        for column, width in widths.items():
+            worksheet.column_dimensions[get_column_letter(column + 1)].width = width + 2
+        for row_cells in cells:
+            worksheet.append(row_cells)
 
     def generate_excel(self) -> None:
-        df = [[self.years[i], self.average_salary[i], self.average_salary_profession[i], self.count_vacancies_by_year[i], self.count_vacancies_by_year_prof[i]] for i in range(len(self.years))]
-        df.insert(0, ["Год", "Средняя зарплата", f"Средняя зарплата - {self.profession}", "Количество вакансий", f"Количество вакансий - {self.profession}"])
-        df = pd.DataFrame(df, columns=None)
-        with pd.ExcelWriter(self.file_name) as writer:
-            df.to_excel(writer, sheet_name='Статистика по годам', index=False, header=False)
-        wb = openpyxl.load_workbook(self.file_name)
-        worksheet1 = wb["Статистика по годам"]
-        thin = Side(border_style="thin")
-        self.add_border_and_align(worksheet1, thin, len(self.years) + 2, ["A", "B", "C", "D", "E"])
-        self.make_max_column_width(worksheet1)
-        wb.save(self.file_name)
+        import openpyxl
+        workbook = openpyxl.Workbook(write_only=True)
+        self.write_sheet(workbook, 'Статистика по годам', self.get_year_rows())
+        for title, rows in self.sheets.items():
+            self.write_sheet(workbook, title, rows)
+        workbook.save(self.file_name)
+
 class SplitCsvFileByYear:
-    def __init__(self, file_name: str, directory: str):
+    def __init__(self, file_name: str, directory: str, max_open_files: int = 32):
         self.file_name = file_name
         self.dir_name = directory
-        self.headlines, self.vacancies = self.csv_reader()
-        self.csv_process(self.headlines, self.vacancies)
+        self.max_open_files = max_open_files
+        self.writers = collections.OrderedDict()
+        self.year_counts = {}
+        self.csv_process()
 
-    def csv_reader(self) -> tuple:
+    def csv_reader(self) -> Iterator[List[str]]:
         with open(self.file_name, encoding='utf-8-sig') as file:
-            file_reader = csv.reader(file)
-            lines = [row for row in file_reader]
-        return lines[0], lines[1:]
+            yield from csv.reader(file)
+
+    def get_year_file_name(self, year: str) -> str:
+        name = os.path.splitext(os.path.basename(self.file_name))
+        return os.path.join(self.dir_name, f'{name[0]}_{year}.csv')
 
+    def csv_writer(self, headlines: List[str], year: str):
+        if year in self.writers:
+            self.writers.move_to_end(year)
+            return self.writers[year][1]
+        if len(self.writers) >= self.max_open_files:
+            self.writers.popitem(last=False)[1][0].close()
+        first_open = year not in self.year_counts
+        file = open(self.get_year_file_name(year), 'w' if first_open else 'a', encoding='utf-8', newline='')
+        writer = csv.writer(file, lineterminator='\n')
+        if first_open:
+            writer.writerow(headlines)
+            self.year_counts[year] = 0
+        self.writers[year] = (file, writer)
+        return writer
 
-    def csv_writer(self, headlines: List[str], vacancies: List[List[str]], cur_year: str) -> None:
-        name = os.path.splitext(self.file_name)
-        vacancies = pd.DataFrame(vacancies, columns=headlines)
-        vacancies.to_csv(f'{self.dir_name}/{name[0]}_{cur_year}.csv', index=False)
+    def remove_previous_split(self) -> None:
+        os.makedirs(self.dir_name, exist_ok=True)
+        name = os.path.splitext(os.path.basename(self.file_name))[0]
+        for file in pathlib.Path(self.dir_name).glob(f'{name}_[0-9][0-9][0-9][0-9].csv'):
+            file.unlink()
 
-    def csv_process(self, headlines: List[str], vacancies: List[List[str]]) -> None:
-        cur_year = "0"
+    def csv_process(self) -> Dict[str, int]:
         self.first_vacancy = ""
-        os.mkdir(self.dir_name)
-        vacancies_cur_year = []
-        for vacancy in vacancies:
-            if (len(vacancy) == len(headlines)) and ((all([v != "" for v in vacancy])) or (vacancy[1] == "" and vacancy[2] != "") or (vacancy[1] != "" and vacancy[2] == "")):
-                vacancy = [" ".join(re.sub("<.*?>", "", value).replace('\n', '; ').split()) for value in vacancy]
-                if len(self.first_vacancy) == 0:
-                    self.first_vacancy = vacancy
-                vacancy_list = [v for v in vacancy]
-                if vacancy[-1][:4] != cur_year:
-                    if len(vacancies_cur_year) != 0:
-                        self.csv_writer(headlines, vacancies_cur_year, cur_year)
-                        vacancies_cur_year.clear()
-                    cur_year = vacancy[-1][:4]
-                vacancies_cur_year.append(vacancy_list)
-                self.last_vacancy = vacancy
-        self.csv_writer(headlines, vacancies_cur_year, cur_year)
+        self.remove_previous_split()
+        rows = self.csv_reader()
+        self.headlines = headlines = next(rows, [])
+        try:
+            for vacancy in rows:
+                if DataSet.is_valid_row(vacancy, len(headlines)):
+                    vacancy = [DataSet.clean_value(value) for value in vacancy]
+                    if len(self.first_vacancy) == 0:
+                        self.first_vacancy = vacancy
+                    year = vacancy[-1][:4]
+                    self.csv_writer(headlines, year).writerow(vacancy)
+                    self.year_counts[year] += 1
+                    self.last_vacancy = vacancy
+        finally:
+            rows.close()
+            for file, _ in self.writers.values():
+                file.close()
+            self.writers.clear()
+        return self.year_counts
+
+class SplitCsvFileByBytes:
+    def __init__(self, file_name: str, chunk_size: int = 32 * 1024 * 1024, block_size: int = 1024 * 1024):
+        self.file_name = file_name
+        self.chunk_size = chunk_size
+        self.block_size = block_size
+        with open(file_name, encoding='utf-8-sig', newline='') as file:
+            self.headlines = next(csv.reader(file), [])
+        self.ranges = self.get_ranges()
+
+    def find_record_start(self, file, position: int, target: int) -> int:
+        in_quotes = False
+        file.seek(position)
+        while position < target:
+            block = file.read(min(self.block_size, target - position))
+            if not block:
+                return position
+            in_quotes ^= block.count(b'"') % 2 == 1
+            position += len(block)
+        while True:
+            block = file.read(self.block_size)
+            if not block:
+                return position
+            start = 0
+            while True:
+                end = block.find(b'\n', start)
+                if end == -1:
+                    in_quotes ^= block.count(b'"', start) % 2 == 1
+                    break
+                in_quotes ^= block.count(b'"', start, end) % 2 == 1
+                if not in_quotes:
+                    return position + end + 1
+                start = end + 1
+            position += len(block)
+
+    def get_ranges(self) -> List[tuple]:
+        size = os.path.getsize(self.file_name)
+        ranges = []
+        with open(self.file_name, 'rb') as file:
+            start = self.find_record_start(file, 0, 0)
+            while start < size:
+                end = self.find_record_start(file, start, min(start + self.chunk_size, size))
+                ranges.append((self.file_name, self.headlines, start, end))
+                start = end
+        return ranges
 
 class ProcessValutes:
-    def __init__(self, date, salary_currency):
+    loaded_table = None
+
+    def __init__(self, date, salary_currency, rate_table: RateTable = None):
         self.date = date
         self.salary_currency = salary_currency
+        self.rate_table = rate_table
 
     def get_currency_valute(self):
         if self.salary_currency == "RUR":
             return 1
-        valutes = pd.read_csv("valutes.csv")
-        valute = valutes.loc[valutes["date"] == self.date]
-        if valute.__contains__(self.salary_currency):
-            return float(valute[self.salary_currency])
-        return 0
+        if self.rate_table is None:
+            self.rate_table = load_valutes_table()
+        return float(self.rate_table.get(month_key(self.date), self.salary_currency, 0))
+
+@functools.lru_cache(maxsize=None)
+def get_currency_valute(date: str, salary_currency: str) -> float:
+    return ProcessValutes(date, salary_currency).get_currency_valute()
+
+def load_valutes_table() -> RateTable:
+    table = load_rate_table(VALUTES_FILE)
+    if table is not ProcessValutes.loaded_table:
+        get_currency_valute.cache_clear()
+        ProcessValutes.loaded_table = table
+    return table
+
+METRICS.watch_cache("rate_cache", get_currency_valute)
 
 class YearSalary:
-    def __init__(self, param: str, salary: Salary):
+    __slots__ = ("param", "accumulator")
+
+    def __init__(self, param: str, salary: Salary = None):
         self.param = param
-        self.salary = salary.get_average_salary()
-        self.count_vacancies = 1
+        self.accumulator = SalaryAccumulator()
+        if salary is not None:
+            self.add_salary(salary)
+
+    @property
+    def salary(self) -> float:
+        return self.accumulator.sum()
+
+    @property
+    def count_vacancies(self) -> int:
+        return self.accumulator.count
 
     def add_salary(self, new_salary: Salary):
-        self.count_vacancies += 1
-        self.salary = self.salary + new_salary.get_average_salary()
+        return self.add_value(new_salary.get_average_salary())
+
+    def add_value(self, value: float):
+        self.accumulator.add(value)
         return self
 
+    def merge(self, other: 'YearSalary'):
+        self.accumulator.merge(other.accumulator)
+        return self
+
+    def to_state(self) -> dict:
+        return self.accumulator.to_state()
+
+    @classmethod
+    def from_state(cls, param: str, state: dict) -> 'YearSalary':
+        year_salary = cls(param)
+        year_salary.accumulator = SalaryAccumulator.from_state(state)
+        return year_salary
+
+    @staticmethod
+    def dump_years(param_salary: Dict[str, 'YearSalary']) -> Dict[str, dict]:
+        return {year: year_salary.to_state() for year, year_salary in param_salary.items()}
+
+    @staticmethod
+    def load_years(state: Dict[str, dict]) -> Dict[str, 'YearSalary']:
+        return {year: YearSalary.from_state(year, year_state) for year, year_state in state.items()}
+
+    def get_distribution(self) -> Dict[str, float]:
+        median, p90 = self.accumulator.quantiles([0.5, 0.9])
+        return {"min": self.accumulator.min, "median": round(median, 2), "p90": round(p90, 2), "max": self.accumulator.max}
+
+
+@functools.lru_cache(maxsize=None)
+def get_graph_figure():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figure = Figure(figsize=(12, 8))
+    FigureCanvasAgg(figure)
+    return figure
+
+def render_graphic(graph: Dict[str, list]) -> str:
+    Graphic(**graph)
+    return graph["file_name"]
 
 class Graphic:
     def __init__(self, profession: str, years: List[int], average_salary: List[int],
                  average_salary_profession: List[int], count_vacancies_by_year: List[int],
-                 count_vacancies_by_year_prof: List[int], file_name : str):
+                 count_vacancies_by_year_prof: List[int], file_name : str, max_bars: int = 40):
         self.years = years
         self.average_salary = average_salary
         self.average_salary_profession = average_salary_profession
         self.count_vacancies_by_year = count_vacancies_by_year
         self.count_vacancies_by_year_prof = count_vacancies_by_year_prof
         self.profession = profession
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 8))
-        self.grouped_bar_graph(ax1, "Уровень зарплат по годам", self.average_salary, self.years,
-                               self.average_salary_profession, 'средняя з/п', f'з/п {self.profession}')
-        self.grouped_bar_graph(ax2, 'Количество вакансий по годам', self.count_vacancies_by_year, self.years,
-                               self.count_vacancies_by_year_prof, 'Количество вакансий',
+        self.max_bars = max_bars
+        years, average_salary, average_salary_profession, count_vacancies_by_year, count_vacancies_by_year_prof = \
+            self.downsample()
+        fig = get_graph_figure()
+        fig.clf()
+        ax1, ax2 = fig.subplots(1, 2)
+        self.grouped_bar_graph(ax1, "Уровень зарплат по годам", average_salary, years,
+                               average_salary_profession, 'средняя з/п', f'з/п {self.profession}')
+        self.grouped_bar_graph(ax2, 'Количество вакансий по годам', count_vacancies_by_year, years,
+                               count_vacancies_by_year_prof, 'Количество вакансий',
                                f'Количество вакансий {self.profession}')
-        plt.tight_layout()
+        fig.tight_layout()
         fig.savefig(file_name)
 
+    @staticmethod
+    def render_many(graphs: List[Dict[str, list]], max_workers: int = None) -> List[str]:
+        if len(graphs) <= 1:
+            return [render_graphic(graph) for graph in graphs]
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            return list(METRICS.map(executor, render_graphic, graphs, "graph"))
+
+    @staticmethod
+    def weighted_average(values: List[int], weights: List[int]) -> int:
+        total = sum(weights)
+        return int(sum(value * weight for value, weight in zip(values, weights)) / total) if total else 0
+
+    def downsample(self) -> tuple:
+        if self.max_bars is None or len(self.years) <= self.max_bars:
+            return (self.years, self.average_salary, self.average_salary_profession, self.count_vacancies_by_year,
+                    self.count_vacancies_by_year_prof)
+        size = -(-len(self.years) // self.max_bars)
+        buckets = [slice(i, i + size) for i in range(0, len(self.years), size)]
+        return ([f"{self.years[b][0]}-{self.years[b][-1]}" for b in buckets],
+                [self.weighted_average(self.average_salary[b], self.count_vacancies_by_year[b]) for b in buckets],
+                [self.weighted_average(self.average_salary_profession[b], self.count_vacancies_by_year_prof[b]) for b in buckets],
+                [sum(self.count_vacancies_by_year[b]) for b in buckets],
+                [sum(self.count_vacancies_by_year_prof[b]) for b in buckets])
+
     def grouped_bar_graph(self, ax, title: str, values_x: List[int], values_y: List[int], values_x2: List[int],
                             label_x: str, label_x2: str) -> None:
+        import numpy as np
         ax.grid(axis='y')
         x = np.arange(len(values_y))
         width = 0.4
@@ -213,33 +443,75 @@ class Graphic:
 class InputConnect:
     def __init__(self):
         input_data = []
-        for question in ["Введите название csv-файла: ", "Введите название профессии: "]:
+        for question in ["Введите название csv-файла: ", "Введите название профессии (несколько - через ';'): ",
+                         "Разделить файл по годам (да/нет): "]:
             print(question, end="")
             input_data.append(input())
         self.csv_file = input_data[0]
         self.profession = input_data[1]
+        self.split_by_year = input_data[2].strip().lower() in ("да", "yes", "y")
 
 class PdfConverter:
-    def __init__(self, graph_name: str, excel_file_name: str, profession: str):
-        self.graph = graph_name
-        self.excel_file = excel_file_name
-        self.prof = profession
-
-    def generate_pdf(self) -> None:
-        env = Environment(loader=FileSystemLoader('.'))
-        template = env.get_template("pdf_template.html")
-        graph_path = os.path.abspath(self.graph)
-        out_stream = xlsx2html(self.excel_file, sheet="Статистика по годам")
-        out_stream.seek(0)
-        pdf_template = template.render({"prof" : self.prof, "graph": graph_path, "first_table" : out_stream.read()})
-        config = pdfkit.configuration(wkhtmltopdf=r"D:\For PDF python\wkhtmltopdf\bin\wkhtmltopdf.exe")
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": ""})
+    def __init__(self, max_workers: int = 4, template_directory: str = None, wkhtmltopdf: str = None):
+        from jinja2 import Environment, FileSystemLoader
+        self.max_workers = max_workers
+        env = Environment(loader=FileSystemLoader(template_directory or os.path.dirname(os.path.abspath(__file__))),
+                          autoescape=True)
+        self.template = env.get_template("pdf_template.html")
+        self.wkhtmltopdf = wkhtmltopdf if wkhtmltopdf is not None else os.environ.get("WKHTMLTOPDF", "")
+        self.configuration = None
+
+    def render_html(self, profession: str, rows: List[list], graph_name: str) -> str:
+        with open(graph_name, "rb") as file:
+            graph = base64.b64encode(file.read()).decode("ascii")
+        return self.template.render({"prof": profession, "graph": graph, "rows": rows})
+
+    def generate_pdf(self, profession: str, rows: List[list], graph_name: str, output: str = "report.pdf") -> str:
+        import pdfkit
+        if self.configuration is None:
+            self.configuration = pdfkit.configuration(wkhtmltopdf=self.wkhtmltopdf)
+        pdfkit.from_string(self.render_html(profession, rows, graph_name), output, configuration=self.configuration)
+        return output
+
+    def generate_many(self, reports: Iterable[tuple]) -> List[str]:
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            return list(executor.map(lambda report: self.generate_pdf(*report), reports))
+
+VacancyRow = collections.namedtuple("VacancyRow", ["name", "area_name", "salary_currency", "year"])
+
+def group_by_year(row: VacancyRow) -> int:
+    return int(row.year)
+
+def group_by_area(row: VacancyRow) -> str:
+    return row.area_name
+
+def group_by_currency(row: VacancyRow) -> str:
+    return row.salary_currency
+
+def group_by_year_area(row: VacancyRow) -> tuple:
+    return int(row.year), row.area_name
+
+GROUP_KEYS = {"year": group_by_year, "area_name": group_by_area, "salary_currency": group_by_currency,
+              "year_area": group_by_year_area}
 
 class Statistic:
-    def __init__(self, profession: str):
+    columns = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+
+    def __init__(self, profession: str, group_keys: Dict[str, Callable] = None):
         self.profession = profession
+        self.group_keys = group_keys
+
+    def get_params(self) -> tuple:
+        return type(self).__name__, self.profession, sorted(self.group_keys or {})
 
-    def process_data(self, file_name: str) -> tuple:
+    def get_result_key(self, file_name: str, *params) -> str:
+        rates_version = load_valutes_table().version if os.path.exists(VALUTES_FILE) else None
+        return ResultCache.get_digest((ColumnCache.get_key(file_name), self.get_params(), rates_version, params))
+
+    def process_data(self, file_name: str, results: ResultCache = None) -> tuple:
+        if results is not None:
+            return results.get_or_compute(self.get_result_key(file_name, "process_data"),
+                                          functools.partial(self.process_data, file_name))
         data = DataSet(file_name).vacancies_objects
         data_profession = [d for d in data if self.profession in d.name]
         year_salary = self.convert_to_param(data)
@@ -248,6 +520,96 @@ class Statistic:
         professions_year_salary, professions_year_vacancies = self.convert_to_dict(professions_year_salary)
         return year_salary, year_vacancy, professions_year_salary, professions_year_vacancies
 
+    def process_data_stream(self, file_name: str) -> tuple:
+        param_salary, param_salary_profession, _ = self.aggregate_rows(DataSet.iter_rows(file_name, self.columns))
+        year_salary = list(param_salary.values())
+        professions_year_salary = self.add_missing_years(list(param_salary_profession.values()), year_salary)
+        year_salary, year_vacancy = self.convert_to_dict(year_salary)
+        professions_year_salary, professions_year_vacancies = self.convert_to_dict(professions_year_salary)
+        return year_salary, year_vacancy, professions_year_salary, professions_year_vacancies
+
+    def process_range(self, file_range: tuple) -> tuple:
+        file_name, headlines, start, end = file_range
+        return self.aggregate_rows(DataSet.iter_range_rows(file_name, headlines, start, end, self.columns))
+
+    def cache_range(self, part: tuple) -> tuple:
+        cache, index, (file_name, headlines, start, end) = part
+        return self.aggregate_rows(cache.record(index, self.columns,
+                                                DataSet.iter_range_rows(file_name, headlines, start, end, self.columns)))
+
+    def process_cached(self, part: tuple) -> tuple:
+        cache, index = part
+        return self.aggregate_rows(cache.iter_rows(index, self.columns))
+
+    def aggregate_rows(self, rows: Iterator[List[str]]) -> tuple:
+        param_salary, param_salary_profession = {}, {}
+        groups = GroupBy(self.group_keys) if self.group_keys else None
+        for name, salary_from, salary_to, salary_currency, area_name, published_at in rows:
+            salary = Salary.calculate_average(Salary.check_void_value(salary_from), Salary.check_void_value(salary_to),
+                                              salary_currency, f"{published_at[5:7]}/{published_at[:4]}")
+            year = published_at[:4]
+            if year not in param_salary:
+                param_salary[year] = YearSalary(year)
+            param_salary[year].add_value(salary)
+            if self.profession in name:
+                if year not in param_salary_profession:
+                    param_salary_profession[year] = YearSalary(year)
+                param_salary_profession[year].add_value(salary)
+            if groups is not None:
+                groups.add(VacancyRow(name, area_name, salary_currency, year), salary)
+        return param_salary, param_salary_profession, groups
+
+    def process_file(self, file_name: str) -> tuple:
+        return self.aggregate_rows(DataSet.iter_rows(file_name, self.columns))
+
+    def merge_partials(self, results: List[tuple]) -> tuple:
+        param_salary, param_salary_profession, groups = {}, {}, None
+        for partial_salary, partial_salary_profession, partial_groups in results:
+            self.merge_years(param_salary, partial_salary)
+            self.merge_years(param_salary_profession, partial_salary_profession)
+            groups = self.merge_groups(groups, partial_groups)
+        return param_salary, param_salary_profession, groups
+
+    @staticmethod
+    def merge_groups(groups: GroupBy or None, partial: GroupBy or None) -> GroupBy or None:
+        if groups is None:
+            return partial
+        if partial is not None:
+            groups.merge(partial)
+        return groups
+
+    def dump_partials(self, partials: tuple) -> tuple:
+        param_salary, param_salary_profession, groups = partials
+        return (YearSalary.dump_years(param_salary), YearSalary.dump_years(param_salary_profession),
+                groups.to_state() if groups is not None else None)
+
+    def load_partials(self, state: tuple) -> tuple:
+        param_salary, param_salary_profession, groups = state
+        return (YearSalary.load_years(param_salary), YearSalary.load_years(param_salary_profession),
+                GroupBy.from_state(self.group_keys, groups) if groups is not None else None)
+
+    @staticmethod
+    def merge_years(merged: Dict[str, YearSalary], partial: Dict[str, YearSalary]) -> None:
+        for year, year_salary in partial.items():
+            if year in merged:
+                merged[year].merge(year_salary)
+            else:
+                merged[year] = year_salary
+
+    def convert_merged(self, param_salary: Dict[str, YearSalary], param_salary_profession: Dict[str, YearSalary]) -> tuple:
+        years = sorted(param_salary)
+        year_salary, year_vacancy = self.convert_to_dict([param_salary[y] for y in years])
+        professions_year_salary, professions_year_vacancies = self.convert_to_dict(
+            [param_salary_profession.get(y, YearSalary(y)) for y in years])
+        return year_salary, year_vacancy, professions_year_salary, professions_year_vacancies
+
+    def merge_ranges(self, results: List[tuple]) -> tuple:
+        param_salary, param_salary_profession, _ = self.merge_partials(results)
+        return self.convert_merged(param_salary, param_salary_profession)
+
+    def get_salary_distribution(self, param_salary: Dict[str, YearSalary]) -> Dict[int, Dict[str, float]]:
+        return {int(year): param_salary[year].get_distribution() for year in sorted(param_salary)}
+
     def convert_to_param(self, vacancies: List[Vacancy]) -> list:
         param_salary = {}
         for vacancy in vacancies:
@@ -267,69 +629,385 @@ class Statistic:
         s_years = [el.param for el in param_salary]
         for y in years:
             if y not in s_years:
-                param_salary.insert(int(y) - int(years[0]), YearSalary(y, Salary("0", "0", "RUR", "2003-10-07T00:00:00+0400")))
-                param_salary[int(y) - int(years[0])].count_vacancies = 0
+                param_salary.insert(int(y) - int(years[0]), YearSalary(y))
         return param_salary
 
+class BatchStatistic(Statistic):
+    def __init__(self, professions: List[str], group_keys: Dict[str, Callable] = None):
+        self.professions = list(dict.fromkeys(professions))
+        super().__init__(self.professions[0] if self.professions else "", group_keys)
+        self.matcher = AhoCorasick(self.professions)
+
+    def get_params(self) -> tuple:
+        return type(self).__name__, self.professions, sorted(self.group_keys or {})
+
+    def process_professions_stream(self, file_name: str) -> tuple:
+        param_salary, param_salary_professions, _ = self.merge_partials([self.process_file(file_name)])
+        return self.convert_professions(param_salary, param_salary_professions)
+
+    def process_data_stream(self, file_name: str) -> tuple:
+        year_salary, year_vacancy, professions = self.process_professions_stream(file_name)
+        return (year_salary, year_vacancy) + professions.get(self.profession, ({}, {}))
+
+    def aggregate_rows(self, rows: Iterator[List[str]]) -> tuple:
+        param_salary = {}
+        param_salary_professions = [{} for _ in self.professions]
+        groups = GroupBy(self.group_keys) if self.group_keys else None
+        for name, salary_from, salary_to, salary_currency, area_name, published_at in rows:
+            salary = Salary.calculate_average(Salary.check_void_value(salary_from), Salary.check_void_value(salary_to),
+                                              salary_currency, f"{published_at[5:7]}/{published_at[:4]}")
+            year = published_at[:4]
+            if year not in param_salary:
+                param_salary[year] = YearSalary(year)
+            param_salary[year].add_value(salary)
+            for index in self.matcher.find(name):
+                param_salary_profession = param_salary_professions[index]
+                if year not in param_salary_profession:
+                    param_salary_profession[year] = YearSalary(year)
+                param_salary_profession[year].add_value(salary)
+            if groups is not None:
+                groups.add(VacancyRow(name, area_name, salary_currency, year), salary)
+        return param_salary, dict(zip(self.professions, param_salary_professions)), groups
+
+    def merge_partials(self, results: List[tuple]) -> tuple:
+        param_salary = {}
+        param_salary_professions = {profession: {} for profession in self.professions}
+        groups = None
+        for partial_salary, partial_salary_professions, partial_groups in results:
+            self.merge_years(param_salary, partial_salary)
+            for profession, partial in partial_salary_professions.items():
+                self.merge_years(param_salary_professions[profession], partial)
+            groups = self.merge_groups(groups, partial_groups)
+        return param_salary, param_salary_professions, groups
+
+    def dump_partials(self, partials: tuple) -> tuple:
+        param_salary, param_salary_professions, groups = partials
+        return (YearSalary.dump_years(param_salary),
+                {profession: YearSalary.dump_years(years) for profession, years in param_salary_professions.items()},
+                groups.to_state() if groups is not None else None)
+
+    def load_partials(self, state: tuple) -> tuple:
+        param_salary, param_salary_professions, groups = state
+        return (YearSalary.load_years(param_salary),
+                {profession: YearSalary.load_years(years) for profession, years in param_salary_professions.items()},
+                GroupBy.from_state(self.group_keys, groups) if groups is not None else None)
+
+    def convert_professions(self, param_salary: Dict[str, YearSalary],
+                            param_salary_professions: Dict[str, Dict[str, YearSalary]]) -> tuple:
+        years = sorted(param_salary)
+        year_salary, year_vacancy = self.convert_to_dict([param_salary[y] for y in years])
+        professions = {profession: self.convert_to_dict([param_salary_profession.get(y, YearSalary(y)) for y in years])
+                       for profession, param_salary_profession in param_salary_professions.items()}
+        return year_salary, year_vacancy, professions
+
+class StatisticState:
+    def __init__(self, professions: List[str], file_name: str = "statistic_state.json"):
+        self.file_name = file_name
+        self.professions = list(dict.fromkeys(professions))
+        self.param_salary = {}
+        self.param_salary_professions = {profession: {} for profession in self.professions}
+        self.ingested = {}
+        self.watermark = None
+        self.new_watermark = None
+        self.late_rows = 0
+        if os.path.exists(file_name):
+            self.load()
+
+    def load(self) -> None:
+        with open(self.file_name, encoding="utf-8") as file:
+            state = json.load(file)
+        if set(state["professions"]) != set(self.professions):
+            raise ValueError(f"{self.file_name} was built for professions {state['professions']}, rebuild it to change them")
+        self.param_salary = YearSalary.load_years(state["param_salary"])
+        self.param_salary_professions = {profession: YearSalary.load_years(years)
+                                         for profession, years in state["param_salary_professions"].items()}
+        self.ingested = state["ingested"]
+        self.watermark = datetime.datetime.fromisoformat(state["watermark"]) if state["watermark"] else None
+
+    def save(self) -> None:
+        state = {"professions": self.professions, "param_salary": YearSalary.dump_years(self.param_salary),
+                 "param_salary_professions": {profession: YearSalary.dump_years(years)
+                                              for profession, years in self.param_salary_professions.items()},
+                 "ingested": self.ingested, "watermark": self.watermark.isoformat() if self.watermark else None}
+        with open(self.file_name + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False)
+        os.replace(self.file_name + ".tmp", self.file_name)
+
+    def filter_new_rows(self, rows: Iterator[List[str]], watermark: datetime.datetime) -> Iterator[List[str]]:
+        for row in rows:
+            published_at = datetime.datetime.fromisoformat(row[-1])
+            if watermark is not None and published_at <= watermark:
+                self.late_rows += 1
+                continue
+            self.new_watermark = published_at if self.new_watermark is None else max(self.new_watermark, published_at)
+            yield row
+
+    def update(self, file_name: str, use_watermark: bool = True) -> int:
+        file_hash = get_file_digest(file_name)
+        if file_hash in self.ingested:
+            self.late_rows = 0
+            return 0
+        stats = BatchStatistic(self.professions)
+        self.new_watermark, self.late_rows = self.watermark, 0
+        rows = self.filter_new_rows(DataSet.iter_rows(file_name, stats.columns, only_valid=True),
+                                    self.watermark if use_watermark else None)
+        param_salary, param_salary_professions, _ = stats.aggregate_rows(rows)
+        stats.merge_years(self.param_salary, param_salary)
+        for profession, partial in param_salary_professions.items():
+            stats.merge_years(self.param_salary_professions[profession], partial)
+        count = sum(year_salary.count_vacancies for year_salary in param_salary.values())
+        self.ingested[file_hash] = {"file_name": file_name, "rows": count, "late_rows": self.late_rows}
+        self.watermark = self.new_watermark
+        self.save()
+        return count
+
+    def get_statistics(self, profession: str) -> tuple:
+        stats = Statistic(profession)
+        return stats.convert_merged(self.param_salary, self.param_salary_professions[profession])
+
+    def get_statistic_files(self, profession: str) -> 'CreateStatisticFiles':
+        year_salary, year_vacancy, professions_year_salary, professions_year_vacancies = self.get_statistics(profession)
+        return CreateStatisticFiles(year_salary, year_vacancy, professions_year_salary, professions_year_vacancies, profession,
+                                    {"Распределение зарплат по годам для выбранной профессии:":
+                                         Statistic(profession).get_salary_distribution(self.param_salary_professions[profession])},
+                                    CreateStatisticFiles.get_name_suffix(profession) if len(self.professions) > 1 else "")
+
+    def create_files(self, results: ResultCache = None, max_workers: int = 4) -> None:
+        files = [self.get_statistic_files(profession) for profession in self.professions]
+        if len(files) == 1:
+            files[0].create_files(results)
+        else:
+            CreateStatisticFiles.create_report_set(files, results, max_workers)
+
 class CreateStatisticFiles:
+    sheet_titles = {"Распределение зарплат по годам:": "Распределение зарплат",
+                    "Распределение зарплат по годам для выбранной профессии:": "Распределение - профессия",
+                    "Статистика по городам (топ-10 по количеству вакансий):": "Статистика по городам"}
+
     def __init__(self, year_salary: Dict[int, int], year_vacancy: Dict[int, int], professions_year_salary: Dict[int, int],
-                 professions_year_vacancies: Dict[int, int], profession: str):
+                 professions_year_vacancies: Dict[int, int], profession: str, distributions: Dict[str, Dict] = None,
+                 name_suffix: str = ""):
         self.year_salary = year_salary
         self.year_vacancy = year_vacancy
         self.professions_year_salary = professions_year_salary
         self.professions_year_vacancies = professions_year_vacancies
         self.profession = profession
+        self.distributions = distributions if distributions is not None else {}
+        self.excel_file = f"report{name_suffix}.xlsx"
+        self.graph_name = f"graph{name_suffix}.png"
+        self.pdf_file = f"report{name_suffix}.pdf"
+
+    @staticmethod
+    def get_name_suffix(profession: str) -> str:
+        slug = re.sub(r"[^\w-]+", "_", profession).strip("_")
+        return f"_{slug}_{hashlib.sha1(profession.encode()).hexdigest()[:8]}"
 
-    def create_files(self) -> None:
-        output_data = {"Динамика уровня зарплат по годам:": self.year_salary,
-                       "Динамика количества вакансий по годам:": self.year_vacancy,
-                       "Динамика уровня зарплат по годам для выбранной профессии:": self.professions_year_salary,
-                       "Динамика количества вакансий по годам для выбранной профессии:": self.professions_year_vacancies}
+    def get_output_data(self) -> Dict[str, Dict]:
+        return {"Динамика уровня зарплат по годам:": self.year_salary,
+                "Динамика количества вакансий по годам:": self.year_vacancy,
+                "Динамика уровня зарплат по годам для выбранной профессии:": self.professions_year_salary,
+                "Динамика количества вакансий по годам для выбранной профессии:": self.professions_year_vacancies,
+                **self.distributions}
+
+    def print_data(self) -> None:
+        output_data = self.get_output_data()
         [print(i, output_data[i]) for i in output_data]
-        excel_file = "report.xlsx"
-        report = Report(profession=self.profession,
-                        years=[i for i in self.year_salary],
-                        average_salary=[self.year_salary[i] for i in self.year_salary],
-                        average_salary_profession=[self.professions_year_salary[i] for i in self.professions_year_salary],
-                        count_vacancies_by_year=[self.year_vacancy[i] for i in self.year_vacancy],
-                        count_vacancies_by_year_prof=[self.professions_year_vacancies[i] for i in self.professions_year_vacancies],
-                        file_name=excel_file)
-        report.generate_excel()
-        graph_name = "graph.png"
-        graph = Graphic(profession=self.profession,
-                        years=[i for i in self.year_salary],
-                        average_salary=[self.year_salary[i] for i in self.year_salary],
-                        average_salary_profession=[self.professions_year_salary[i] for i in self.professions_year_salary],
-                        count_vacancies_by_year=[self.year_vacancy[i] for i in self.year_vacancy],
-                        count_vacancies_by_year_prof=[self.professions_year_vacancies[i] for i in self.professions_year_vacancies],
-                        file_name=graph_name)
-        pdf = PdfConverter(graph_name=graph_name,
-                           excel_file_name=excel_file,
-                           profession=self.profession)
-        pdf.generate_pdf()
+
+    def get_sheets(self) -> Dict[str, List[list]]:
+        sheets = {}
+        for label, table in self.distributions.items():
+            columns = list(next(iter(table.values()), {}))
+            sheets[self.sheet_titles.get(label, label)] = \
+                [[""] + columns] + [[key] + [values[column] for column in columns] for key, values in table.items()]
+        return sheets
+
+    def get_artifact_digest(self, file_name: str) -> str:
+        return ResultCache.get_digest((file_name, self.profession, self.year_salary, self.year_vacancy,
+                                       self.professions_year_salary, self.professions_year_vacancies, self.distributions))
+
+    def build_artifact(self, file_name: str, build: Callable[[], None], results: ResultCache = None) -> None:
+        digest = self.get_artifact_digest(file_name)
+        if results is not None and results.is_artifact_fresh(file_name, digest):
+            METRICS.count("artifacts_fresh")
+            return
+        build()
+        METRICS.count("artifacts_built")
+        if results is not None:
+            results.mark_artifact(file_name, digest)
+
+    def get_report(self) -> Report:
+        return Report(profession=self.profession,
+                      years=[i for i in self.year_salary],
+                      average_salary=[self.year_salary[i] for i in self.year_salary],
+                      average_salary_profession=[self.professions_year_salary[i] for i in self.professions_year_salary],
+                      count_vacancies_by_year=[self.year_vacancy[i] for i in self.year_vacancy],
+                      count_vacancies_by_year_prof=[self.professions_year_vacancies[i] for i in self.professions_year_vacancies],
+                      file_name=self.excel_file, sheets=self.get_sheets())
+
+    def get_graph_args(self) -> Dict[str, list]:
+        return {"profession": self.profession,
+                "years": [i for i in self.year_salary],
+                "average_salary": [self.year_salary[i] for i in self.year_salary],
+                "average_salary_profession": [self.professions_year_salary[i] for i in self.professions_year_salary],
+                "count_vacancies_by_year": [self.year_vacancy[i] for i in self.year_vacancy],
+                "count_vacancies_by_year_prof": [self.professions_year_vacancies[i] for i in self.professions_year_vacancies],
+                "file_name": self.graph_name}
+
+    def get_pdf_args(self) -> tuple:
+        return self.profession, list(self.get_report().get_year_rows()), self.graph_name, self.pdf_file
+
+    def create_report_files(self, results: ResultCache = None) -> None:
+        with METRICS.stage("excel"):
+            self.build_artifact(self.excel_file, self.get_report().generate_excel, results)
+        with METRICS.stage("graph"):
+            self.build_artifact(self.graph_name, lambda: Graphic(**self.get_graph_args()), results)
+
+    def create_files(self, results: ResultCache = None, converter: PdfConverter = None) -> None:
+        self.print_data()
+        self.create_report_files(results)
+        with METRICS.stage("pdf"):
+            converter = converter if converter is not None else PdfConverter()
+            self.build_artifact(self.pdf_file, lambda: converter.generate_pdf(*self.get_pdf_args()), results)
+
+    @staticmethod
+    def get_stale_files(files: List['CreateStatisticFiles'], file_name: Callable[['CreateStatisticFiles'], str],
+                        results: ResultCache = None) -> List['CreateStatisticFiles']:
+        stale = [statistic_files for statistic_files in files if results is None or not results.is_artifact_fresh(
+            file_name(statistic_files), statistic_files.get_artifact_digest(file_name(statistic_files)))]
+        METRICS.count("artifacts_fresh", len(files) - len(stale))
+        METRICS.count("artifacts_built", len(stale))
+        return stale
+
+    @staticmethod
+    def mark_files(files: List['CreateStatisticFiles'], file_name: Callable[['CreateStatisticFiles'], str],
+                   results: ResultCache = None) -> None:
+        if results is not None:
+            for statistic_files in files:
+                results.mark_artifact(file_name(statistic_files), statistic_files.get_artifact_digest(file_name(statistic_files)))
+
+    @staticmethod
+    def create_report_set(files: List['CreateStatisticFiles'], results: ResultCache = None, max_workers: int = 4) -> None:
+        for statistic_files in files:
+            print(statistic_files.profession)
+            statistic_files.print_data()
+            with METRICS.stage("excel"):
+                statistic_files.build_artifact(statistic_files.excel_file, statistic_files.get_report().generate_excel, results)
+        graph_name, pdf_file = operator.attrgetter("graph_name"), operator.attrgetter("pdf_file")
+        with METRICS.stage("graph"):
+            pending = CreateStatisticFiles.get_stale_files(files, graph_name, results)
+            Graphic.render_many([statistic_files.get_graph_args() for statistic_files in pending], max_workers)
+            CreateStatisticFiles.mark_files(pending, graph_name, results)
+        with METRICS.stage("pdf"):
+            pending = CreateStatisticFiles.get_stale_files(files, pdf_file, results)
+            PdfConverter(max_workers).generate_many([statistic_files.get_pdf_args() for statistic_files in pending])
+            CreateStatisticFiles.mark_files(pending, pdf_file, results)
 
 
 class GetValutesValues:
-    def __init__(self, valutes):
+    reference_valute = "USD"
+
+    def __init__(self, valutes, cache: RatesCache = None, base_url: str = None, lookback_days: int = 14):
         self.valutes = valutes
+        self.cache = cache if cache is not None else RatesCache()
+        self.base_url = base_url if base_url is not None else CBR_URL
+        self.lookback_days = lookback_days
+        self.session = None
+
+    def get_session(self):
+        if self.session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3 import Retry
+            self.session = requests.Session()
+            adapter = HTTPAdapter(max_retries=Retry(connect=3, backoff_factor=0.5))
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+        return self.session
+
+    def get(self, endpoint: str, query: str, stream: bool = False):
+        METRICS.count("cbr_requests")
+        response = self.get_session().get(f"{self.base_url}/{endpoint}?{query}", stream=stream)
+        response.raise_for_status()
+        return response
 
     def get_valutes(self, date) -> list:
-        session = requests.Session()
-        retry = Retry(connect=3, backoff_factor=0.5)
-        adapter = HTTPAdapter(max_retries=retry)
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
-        url = f"https://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{date}d=1"
-        res = session.get(url)
-        cur_df = pd.read_xml(res.text)
+        rates = self.cache.read_through(f"{date[3:]}-{date[:2]}-01", lambda: self.fetch_rates(date))
         values = []
         for valut in self.valutes:
-            if valut in cur_df["CharCode"].values:
-                values.append(round(float(cur_df.loc[cur_df["CharCode"] == valut]["Value"].values[0].replace(',', ".")) / float(cur_df.loc[cur_df["CharCode"] == valut]["Nominal"]), 4))
+            if rates is not None and valut in rates:
+                values.append(round(rates[valut], 4))
             else:
                 values.append(0)
         return [date] + values
 
+    def fetch_rates(self, date) -> dict:
+        return parse_daily_rates(self.get("XML_daily.asp", f"date_req=01/{date}").content)
+
+    def get_valute_ids(self) -> Dict[str, str]:
+        ids = parse_valute_ids(self.get("XML_val.asp", "d=0").content)
+        if any(valut not in ids for valut in self.valutes):
+            for valut, valute_id in parse_valute_ids(self.get("XML_val.asp", "d=1").content).items():
+                ids.setdefault(valut, valute_id)
+        return ids
+
+    def fetch_dynamic(self, valute_id: str, first: datetime.date, last: datetime.date) -> Iterator[tuple]:
+        response = self.get("XML_dynamic.asp", f"date_req1={first:%d/%m/%Y}&date_req2={last:%d/%m/%Y}"
+                                               f"&VAL_NM_RQ={valute_id}", stream=True)
+        response.raw.decode_content = True
+        with response:
+            yield from parse_dynamic_rates(response.raw)
+
+    @staticmethod
+    def get_month_records(records: Iterator[tuple], months: List[tuple]) -> List[tuple or None]:
+        month_records, last = [], None
+        for record in records:
+            while len(month_records) < len(months) and record[0] > months[len(month_records)][0]:
+                month_records.append(last)
+            last = record
+        return month_records + [last] * (len(months) - len(month_records))
+
+    def get_rate_table(self, dates: List[str]) -> RateTable:
+        keys = [month_key(date) for date in dates]
+        table = RateTable(self.valutes, min(keys), max(keys))
+        cached = self.cache.get_many([f"{date[3:]}-{date[:2]}-01" for date in dates])
+        missing = []
+        for date, key in zip(dates, keys):
+            rates = cached.get(f"{date[3:]}-{date[:2]}-01")
+            if rates is None:
+                missing.append((datetime.date(int(date[3:]), int(date[:2]), 1), key))
+                continue
+            for valut in self.valutes:
+                if valut in rates:
+                    table.set(key, valut, rates[valut])
+        if not missing:
+            return table
+        missing.sort()
+        first, last = missing[0][0] - datetime.timedelta(days=self.lookback_days), missing[-1][0]
+        ids = self.get_valute_ids()
+        valutes = [valut for valut in self.valutes if valut in ids]
+        fetched = valutes + [self.reference_valute] if self.reference_valute not in valutes else valutes
+        month_records = {valut: self.get_month_records(self.fetch_dynamic(ids[valut], first, last), missing)
+                         for valut in fetched if valut in ids}
+        for index, (date, key) in enumerate(missing):
+            records = {valut: records[index] for valut, records in month_records.items() if records[index] is not None}
+            if not records:
+                continue
+            rate_date = max(record[0] for record in records.values())
+            if (date - rate_date).days > self.lookback_days:
+                continue
+            for valut in valutes:
+                if valut in records and records[valut][0] == rate_date:
+                    table.set(key, valut, records[valut][1])
+        return table
+
+    def get_many_valutes(self, dates: List[str]) -> List[list]:
+        table = self.get_rate_table(dates)
+        rows = []
+        for date in dates:
+            values = [table.get(month_key(date), valut) for valut in self.valutes]
+            rows.append([date] + [round(float(value), 4) if value == value else 0 for value in values])
+        return rows
+
 
     def get_date(first_date, second_date) -> list:
         res = []
@@ -347,17 +1025,181 @@ class GetValutesValues:
         return res
 
 
+def process_file_parallel(stats: Statistic, file_name: str, split_by_year: bool) -> tuple:
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        if split_by_year:
+            with METRICS.stage("split"):
+                split = SplitCsvFileByYear(file_name, directory)
+            files = [split.get_year_file_name(year) for year in sorted(split.year_counts)]
+            with METRICS.stage("parse"):
+                return stats.merge_partials(METRICS.map(executor, stats.process_file, files, "parse"))
+        cache = ColumnCache(file_name, CACHE_DIRECTORY)
+        if cache.is_complete():
+            METRICS.count("column_cache_hits")
+            with METRICS.stage("parse"):
+                return stats.merge_partials(METRICS.map(executor, stats.process_cached, cache.get_parts(), "parse"))
+        METRICS.count("column_cache_misses")
+        with METRICS.stage("split"):
+            ranges = SplitCsvFileByBytes(file_name).ranges
+        with METRICS.stage("parse"):
+            partials = stats.merge_partials(METRICS.map(executor, stats.cache_range,
+                                                        [(cache, index, r) for index, r in enumerate(ranges)], "parse"))
+    cache.commit(len(ranges), stats.columns)
+    return partials
+
 directory = 'vacancies_by_year'
+CBR_URL = "https://www.cbr.ru/scripts"
+VALUTES_FILE = "valutes.csv"
+CACHE_DIRECTORY = "vacancies_cache"
+RESULTS_DIRECTORY = "statistic_results"
+def compute_statistics(csv_file: str, professions: List[str], split_by_year: bool = False) -> tuple:
+    group_keys = {"area_name": group_by_area}
+    stats = Statistic(professions[0], group_keys) if len(professions) <= 1 else BatchStatistic(professions, group_keys)
+    with METRICS.stage("rates"):
+        if os.path.exists(VALUTES_FILE):
+            load_valutes_table()
+    results = ResultCache(RESULTS_DIRECTORY)
+    with METRICS.stage("statistics"):
+        param_salary, param_salary_profession, groups = stats.load_partials(results.get_or_compute(
+            stats.get_result_key(csv_file, "partials", split_by_year),
+            lambda: stats.dump_partials(process_file_parallel(stats, csv_file, split_by_year))))
+    return stats, results, param_salary, param_salary_profession, groups
+
+def get_statistic_files(csv_file: str, professions: List[str], split_by_year: bool = False) -> tuple:
+    stats, results, param_salary, param_salary_profession, groups = compute_statistics(csv_file, professions, split_by_year)
+    areas = {"Статистика по городам (топ-10 по количеству вакансий):": groups.get_table("area_name", 10)} \
+        if groups is not None else {}
+    if isinstance(stats, BatchStatistic):
+        year_salary, year_vacancy, professions_data = stats.convert_professions(param_salary, param_salary_profession)
+        return results, areas, [
+            CreateStatisticFiles(year_salary, year_vacancy, professions_year_salary, professions_year_vacancies, profession,
+                                 {"Распределение зарплат по годам для выбранной профессии:":
+                                      stats.get_salary_distribution(param_salary_profession[profession])},
+                                 CreateStatisticFiles.get_name_suffix(profession))
+            for profession, (professions_year_salary, professions_year_vacancies) in professions_data.items()]
+    year_salary, year_vacancy, professions_year_salary, professions_year_vacancies = \
+        stats.convert_merged(param_salary, param_salary_profession)
+    distributions = {"Распределение зарплат по годам:": stats.get_salary_distribution(param_salary),
+                     "Распределение зарплат по годам для выбранной профессии:": stats.get_salary_distribution(param_salary_profession),
+                     **areas}
+    return results, {}, [CreateStatisticFiles(year_salary, year_vacancy, professions_year_salary, professions_year_vacancies,
+                                               professions[0], distributions)]
+
+def run_split(args: argparse.Namespace) -> None:
+    for year, count in sorted(SplitCsvFileByYear(args.csv_file, args.directory).year_counts.items()):
+        print(year, count)
+
+def run_stats(args: argparse.Namespace) -> None:
+    results, areas, files = get_statistic_files(args.csv_file, args.professions, args.split_by_year)
+    if args.json:
+        json.dump({**{label: table for label, table in areas.items()},
+                   **{statistic_files.profession: statistic_files.get_output_data() for statistic_files in files}},
+                  sys.stdout, ensure_ascii=False, indent=2, default=str)
+        print()
+        return
+    if areas:
+        print(*next(iter(areas.items())))
+    for statistic_files in files:
+        if len(files) > 1:
+            print(statistic_files.profession)
+        statistic_files.print_data()
+
+def run_report(args: argparse.Namespace) -> None:
+    results, areas, files = get_statistic_files(args.csv_file, args.professions, args.split_by_year)
+    if areas:
+        print(*next(iter(areas.items())))
+    if len(files) == 1:
+        files[0].create_files(results)
+    else:
+        CreateStatisticFiles.create_report_set(files, results, args.workers)
+
+def run_update(args: argparse.Namespace) -> None:
+    state = StatisticState(args.professions, args.state)
+    watermark = state.watermark
+    count = state.update(args.csv_file, not args.no_watermark)
+    if count == 0 and not state.late_rows:
+        print(f"{args.csv_file}: файл уже загружен или не содержит новых строк")
+    else:
+        print(f"{args.csv_file}: добавлено строк: {count}")
+    if state.late_rows:
+        print(f"{args.csv_file}: пропущено строк, опубликованных не позже {watermark.isoformat()}: {state.late_rows}; "
+              f"повторите с --no-watermark, если это не повторы из прошлых выгрузок", file=sys.stderr)
+    if args.report:
+        state.create_files(ResultCache(RESULTS_DIRECTORY), args.workers)
+        return
+    for profession in state.professions:
+        if len(state.professions) > 1:
+            print(profession)
+        state.get_statistic_files(profession).print_data()
+
+def run_rates(args: argparse.Namespace) -> None:
+    valutes = GetValutesValues(args.currencies, base_url=args.base_url)
+    dates = GetValutesValues.get_date(args.start, args.end)
+    with open(args.output, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["date"] + args.currencies)
+        if args.bulk:
+            writer.writerows(valutes.get_many_valutes(dates))
+            return
+        for date in dates:
+            writer.writerow(valutes.get_valutes(date))
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Статистика зарплат и вакансий по годам")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--metrics", metavar="FILE", help="записать метрики этапов в json-файл")
+    common.add_argument("--profile", metavar="STAGE", help="профилировать этап через cProfile "
+                                                           "(split, parse, rates, statistics, excel, graph, pdf или команду)")
+    common.add_argument("--profile-output", metavar="FILE", help="файл статистики профилировщика, по умолчанию STAGE.prof")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    split = subparsers.add_parser("split", help="разделить csv-файл по годам", parents=[common])
+    split.add_argument("csv_file")
+    split.add_argument("--directory", default=directory)
+    split.set_defaults(run=run_split)
+    for name, run, help_text in (("stats", run_stats, "вывести статистику"),
+                                 ("report", run_report, "создать xlsx, png и pdf отчёты")):
+        command = subparsers.add_parser(name, help=help_text, parents=[common])
+        command.add_argument("csv_file")
+        command.add_argument("professions", nargs="+")
+        command.add_argument("--split-by-year", action="store_true")
+        command.set_defaults(run=run)
+    update = subparsers.add_parser("update", help="добавить новую выгрузку в накопленную статистику", parents=[common])
+    update.add_argument("csv_file")
+    update.add_argument("professions", nargs="+")
+    update.add_argument("--state", default="statistic_state.json", help="файл накопленной статистики")
+    update.add_argument("--no-watermark", action="store_true",
+                        help="учитывать все строки файла, а не только опубликованные после последней загрузки")
+    update.add_argument("--report", action="store_true", help="создать xlsx, png и pdf отчёты")
+    update.add_argument("--workers", type=int, default=4)
+    update.set_defaults(run=run_update)
+    subparsers.choices["stats"].add_argument("--json", action="store_true")
+    subparsers.choices["report"].add_argument("--workers", type=int, default=4)
+    rates = subparsers.add_parser("rates", help="загрузить курсы валют ЦБ РФ в csv-файл", parents=[common])
+    rates.add_argument("start", help="первый месяц, ГГГГ-ММ")
+    rates.add_argument("end", help="последний месяц, ГГГГ-ММ")
+    rates.add_argument("--currencies", nargs="+", default=["USD", "KZT", "BYR", "UAH", "EUR"])
+    rates.add_argument("--output", default=VALUTES_FILE)
+    rates.add_argument("--bulk", action="store_true", help="один запрос XML_dynamic.asp на валюту за весь период")
+    rates.add_argument("--base-url", default=CBR_URL)
+    rates.set_defaults(run=run_rates)
+    return parser
+
+def main(argv: List[str] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        inp = InputConnect()
+        argv = ["report", inp.csv_file] + [profession.strip() for profession in inp.profession.split(";") if profession.strip()]
+        argv += ["--split-by-year"] if inp.split_by_year else []
+    args = create_parser().parse_args(argv)
+    if args.metrics is None and args.profile is None:
+        args.run(args)
+        return
+    METRICS.enable(args.profile, args.profile_output)
+    try:
+        with METRICS.stage(args.command):
+            args.run(args)
+    finally:
+        METRICS.save(args.metrics)
+
 if __name__ == "__main__":
-    year_salary, year_vacancy, professions_year_salary, professions_year_vacancies = {}, {}, {}, {}
-    inp = InputConnect()
-    spl = SplitCsvFileByYear(inp.csv_file, directory)
-    start = time.time()
-    files = [str(file) for file in pathlib.Path(f"./{directory}").iterdir()]
-    stats = Statistic(inp.profession)
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        r = list(executor.map(stats.process_data, files))
-        for el in r:
-            for i, value in zip(range(4), [year_salary, year_vacancy, professions_year_salary, professions_year_vacancies]):
-                value.update(el[i])
-    CreateStatisticFiles(year_salary, year_vacancy, professions_year_salary, professions_year_vacancies, inp.profession).create_files()
\ No newline at end of file
+    main()
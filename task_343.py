@@ -3,6 +3,7 @@ import os
 import pathlib
 from typing import List, Dict
 import re
+import sys
 import numpy as np
 import pandas as pd
 import openpyxl
@@ -18,19 +19,22 @@ from urllib3 import Retry
 from xlsx2html import xlsx2html
 import time
 import concurrent.futures
+from rates_cache import RatesCache, parse_daily_rates
 
 
 
 class Vacancy:
+    __slots__ = ("name", "salary", "area_name", "published_at", "year")
+
     def __init__(self, vacancy: Dict[str, str]):
         self.name = vacancy["name"]
         self.salary = Salary(salary_from=vacancy["salary_from"],
                              salary_to=vacancy["salary_to"],
                              salary_currency=vacancy["salary_currency"],
                              published_at=vacancy["published_at"])
-        self.area_name = vacancy["area_name"]
+        self.area_name = sys.intern(str(vacancy["area_name"]))
         self.published_at = vacancy["published_at"]
-        self.year = self.published_at[:4]
+        self.year = sys.intern(str(self.published_at[:4]))
 
     def get_array_vacancy(self) -> List[str]:
         return [self.name, self.salary.get_average_salary(), self.area_name, self.published_at]
@@ -55,13 +59,15 @@ class DataSet:
         return result
 
 class Salary:
+    __slots__ = ("salary_from", "salary_to", "salary_currency", "month_year")
+
     def __init__(self, salary_from: str or int or float, salary_to: str or int or float, salary_currency: str, published_at: str):
-        self.salary_from = self.check_void_value()
-        self.salary_to = self.check_void_value()
-        self.salary_currency = salary_currency
-        self.published_at = published_at
-        self.month_year = f"{self.published_at[5:7]}/{self.published_at[:4]}"
+        self.salary_from = self.check_void_value(salary_from)
+        self.salary_to = self.check_void_value(salary_to)
+        self.salary_currency = sys.intern(str(salary_currency))
+        self.month_year = sys.intern(f"{published_at[5:7]}/{published_at[:4]}")
 
+    @staticmethod
     def check_void_value(value: str or int or float) -> float:
         if type(value) == str and value == "":
             return 0
@@ -240,25 +246,29 @@ class PdfConverter:
         pdfkit.from_string(pdf_template, 'report3.pdf', configuration=config, options={"enable-local-file-access": ""})
 
 class GetValutesValues:
-    def __init__(self, valutes):
+    def __init__(self, valutes, cache: RatesCache = None):
         self.valutes = valutes
+        self.cache = cache if cache is not None else RatesCache()
 
     def get_valutes(self, date) -> list:
+        rates = self.cache.read_through(f"{date[3:]}-{date[:2]}-01", lambda: self.fetch_rates(date))
+        values = []
+        for valute in self.valutes:
+            if rates is not None and valute in rates:
+                values.append(round(rates[valute], 4))
+            else:
+                values.append(0)
+        return [date] + values
+
+    def fetch_rates(self, date) -> dict:
         session = requests.Session()
         retry = Retry(connect = 3, backoff_factor = 0.5)
         adapter = HTTPAdapter(max_retries=retry)
         session.mount('http://', adapter)
         session.mount('https://', adapter)
-        url = f"https://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{date}d=1"
+        url = f"https://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{date}"
         res = session.get(url)
-        cur_df = pd.read_xml(res.text)
-        values = []
-        for valute in self.valutes:
-            if valute in cur_df["CharCode"].values:
-                values.append(round(float(cur_df.loc[cur_df["CharCode"] == valute]["Value"].values[0].replace(',', ".")) / float(cur_df.loc[cur_df["CharCode"] == valute]["Nominal"]), 4))
-            else:
-                values.append(0)
-        return [date] + values
+        return parse_daily_rates(res.content)
 
     def get_date(first_date, second_date) -> list:
         resultes = []
@@ -1,13 +1,122 @@
-import pandas as pd
+import csv
+import json
 import sqlite3
+from typing import Dict, Iterable, List
+import pandas as pd
+from task_342 import DataSet
+
+VACANCY_COLUMNS = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+def connect(db_name: str = 'currencies_db') -> sqlite3.Connection:
+    conn_db = sqlite3.connect(db_name, isolation_level=None)
+    conn_db.execute('PRAGMA journal_mode = WAL')
+    conn_db.execute('PRAGMA synchronous = NORMAL')
+    conn_db.execute('PRAGMA temp_store = MEMORY')
+    conn_db.execute('PRAGMA cache_size = -65536')
+    conn_db.execute('PRAGMA mmap_size = 268435456')
+    return conn_db
+
+def create_currencies_table(c: sqlite3.Cursor) -> None:
+    columns = [row[1] for row in c.execute('PRAGMA table_info(currencies)')]
+    if columns and 'date' in columns:
+        c.execute('ALTER TABLE currencies RENAME TO currencies_wide')
+    c.execute('CREATE TABLE IF NOT EXISTS currencies (month text, char_code text, rate real, '
+              'PRIMARY KEY (month, char_code)) WITHOUT ROWID')
+    if columns and 'date' in columns:
+        for currency in columns:
+            if currency != 'date' and not currency.startswith('Unnamed'):
+                c.execute(f'INSERT INTO currencies SELECT date, ?, "{currency}" FROM currencies_wide '
+                          f'WHERE "{currency}" IS NOT NULL', (currency,))
+        c.execute('DROP TABLE currencies_wide')
+
+def upsert_rates(rows: Iterable[tuple], db_name: str = 'currencies_db') -> int:
+    conn_db = connect(db_name)
+    c = conn_db.cursor()
+    c.execute('BEGIN')
+    create_currencies_table(c)
+    changes = conn_db.total_changes
+    c.executemany('INSERT INTO currencies (month, char_code, rate) VALUES (?, ?, ?) '
+                  'ON CONFLICT (month, char_code) DO UPDATE SET rate = excluded.rate '
+                  'WHERE rate IS NOT excluded.rate', rows)
+    changes = conn_db.total_changes - changes
+    c.execute('COMMIT')
+    conn_db.close()
+    return changes
 
-def get_sql_from_csv(file_name: str) -> None:
+def get_sql_from_csv(file_name: str, db_name: str = 'currencies_db') -> int:
     data = pd.read_csv(file_name)
-    conn_db = sqlite3.connect('currencies_db')
+    currencies = [column for column in data.columns if column != 'date' and not column.startswith('Unnamed')]
+    data = data.melt(id_vars='date', value_vars=currencies, var_name='char_code', value_name='rate').dropna()
+    return upsert_rates(zip(data['date'].astype(str).str[:7], data['char_code'], data['rate'].astype(float)), db_name)
+
+def get_rates(months: Iterable[str], char_codes: Iterable[str], db_name: str = 'currencies_db') -> Dict[tuple, float]:
+    conn_db = connect(db_name)
+    rows = conn_db.execute('SELECT month, char_code, rate FROM currencies '
+                           'WHERE month IN (SELECT value FROM json_each(?)) '
+                           'AND char_code IN (SELECT value FROM json_each(?))',
+                           (json.dumps(list(months)), json.dumps(list(char_codes)))).fetchall()
+    conn_db.close()
+    return {(month, char_code): rate for month, char_code, rate in rows}
+
+def to_number(value: str) -> float or None:
+    return float(value) if value != '' else None
+
+def load_vacancies(file_name: str, db_name: str = 'currencies_db', batch_size: int = 50000, replace: bool = True) -> int:
+    conn_db = connect(db_name)
     c = conn_db.cursor()
-    c.execute('CREATE TABLE IF NOT EXISTS currencies (date text, RUR number, USD number, KZT number, BYR number,'
-              'UAH number, EUR number)')
-    conn_db.commit()
-    data.to_sql('currencies', conn_db, if_exists='replace', index=False)
+    c.execute('CREATE TABLE IF NOT EXISTS vacancies (name text, salary_from number, salary_to number, '
+              'salary_currency text, area_name text, published_at text, month text)')
+    count = 0
+    c.execute('BEGIN')
+    if replace:
+        c.execute('DELETE FROM vacancies')
+    for index in ('vacancies_month', 'vacancies_currency', 'vacancies_area'):
+        c.execute(f'DROP INDEX IF EXISTS {index}')
+    with open(file_name, encoding='utf-8-sig') as file:
+        file_reader = csv.reader(file)
+        headlines = next(file_reader, [])
+        batch = []
+        for row in DataSet.select_rows(file_reader, headlines, VACANCY_COLUMNS, only_valid=True):
+            name, salary_from, salary_to, salary_currency, area_name, published_at = row
+            batch.append((name, to_number(salary_from), to_number(salary_to), salary_currency, area_name,
+                          published_at, published_at[:7]))
+            if len(batch) >= batch_size:
+                c.executemany('INSERT INTO vacancies VALUES (?, ?, ?, ?, ?, ?, ?)', batch)
+                count += len(batch)
+                batch.clear()
+        c.executemany('INSERT INTO vacancies VALUES (?, ?, ?, ?, ?, ?, ?)', batch)
+        count += len(batch)
+    c.execute('CREATE INDEX vacancies_month ON vacancies (month)')
+    c.execute('CREATE INDEX vacancies_currency ON vacancies (salary_currency)')
+    c.execute('CREATE INDEX vacancies_area ON vacancies (area_name)')
+    c.execute('COMMIT')
+    c.execute('ANALYZE')
+    conn_db.close()
+    return count
+
+SALARY_SQL = ("round((coalesce(v.salary_from, 0) + coalesce(v.salary_to, 0)) * "
+              "(CASE v.salary_currency WHEN 'RUR' THEN 1 ELSE c.rate END) / 2, 4)")
+
+def get_year_statistics(profession: str, db_name: str = 'currencies_db') -> tuple:
+    conn_db = connect(db_name)
+    rows = conn_db.execute(f'''
+        SELECT year, count(*), sum(salary), sum(instr(name, :profession) > 0),
+               sum(CASE WHEN instr(name, :profession) > 0 THEN salary ELSE 0 END)
+        FROM (SELECT substr(v.month, 1, 4) AS year, v.name AS name, coalesce({SALARY_SQL}, 0) AS salary
+              FROM vacancies v LEFT JOIN currencies c ON c.month = v.month AND c.char_code = v.salary_currency)
+        GROUP BY year ORDER BY year''', {'profession': profession}).fetchall()
+    conn_db.close()
+    year_salary = {int(year): int(total / count) for year, count, total, _, _ in rows}
+    year_vacancy = {int(year): count for year, count, _, _, _ in rows}
+    professions_year_salary = {int(year): int(total / count) if count else 0 for year, _, _, count, total in rows}
+    professions_year_vacancies = {int(year): count for year, _, _, count, _ in rows}
+    return year_salary, year_vacancy, professions_year_salary, professions_year_vacancies
+
+def query(sql: str, params: Dict or List = (), db_name: str = 'currencies_db') -> List[tuple]:
+    conn_db = connect(db_name)
+    rows = conn_db.execute(sql, params).fetchall()
+    conn_db.close()
+    return rows
 
-get_sql_from_csv('dataframe51.csv')
\ No newline at end of file
+if __name__ == "__main__":
+    get_sql_from_csv('dataframe51.csv')
@@ -0,0 +1,19 @@
+import csv
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def write_vacancies(tmp_path):
+    from task_342 import Statistic
+
+    def write(rows, file_name: str = "vacancies.csv") -> str:
+        path = tmp_path / file_name
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(Statistic.columns)
+            writer.writerows(rows)
+        return str(path)
+    return write
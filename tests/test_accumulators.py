@@ -0,0 +1,72 @@
+import math
+import random
+import numpy as np
+import pytest
+from accumulators import ExactSum, SalaryAccumulator, TDigest
+
+def exact_sum(values) -> float:
+    total = ExactSum()
+    for value in values:
+        total.add(value)
+    return total.value()
+
+def test_exact_sum_cancelling_values():
+    assert exact_sum([1e100, 1.0, -1e100]) == 1.0
+    assert exact_sum([1e16, 1.0, 1.0, -1e16]) == 2.0
+    assert exact_sum([0.1] * 10) == 1.0
+    assert sum([1e100, 1.0, -1e100]) == 0.0
+
+def test_exact_sum_matches_fsum():
+    rng = random.Random(3)
+    values = [rng.uniform(-1, 1) * 10 ** rng.randint(-20, 20) for _ in range(5000)]
+    assert exact_sum(values) == math.fsum(values)
+
+def test_exact_sum_merge_matches_single_sum():
+    rng = random.Random(4)
+    values = [rng.uniform(-1e12, 1e12) for _ in range(3000)] + [1e-3] * 1000
+    parts = [ExactSum() for _ in range(7)]
+    for i, value in enumerate(values):
+        parts[i % 7].add(value)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.value() == math.fsum(values)
+
+@pytest.mark.parametrize("distribution", ["uniform", "lognormal", "exponential"])
+def test_tdigest_quantiles_close_to_numpy(distribution):
+    rng = np.random.default_rng(5)
+    values = getattr(rng, distribution)(size=50000)
+    digest = TDigest()
+    for value in values:
+        digest.add(float(value))
+    ordered = np.sort(values)
+    for q in (0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999):
+        rank = np.searchsorted(ordered, digest.quantile(q)) / len(ordered)
+        assert abs(rank - q) <= 0.002
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        expected = np.percentile(values, q * 100)
+        assert abs(digest.quantile(q) - expected) <= 0.01 * expected
+
+def test_tdigest_merge_close_to_numpy():
+    rng = np.random.default_rng(6)
+    values = rng.lognormal(11, 0.5, 40000)
+    digests = [TDigest() for _ in range(8)]
+    for i, value in enumerate(values):
+        digests[i % 8].add(float(value))
+    merged = digests[0]
+    for digest in digests[1:]:
+        merged.merge(digest)
+    for q in (0.1, 0.5, 0.9):
+        expected = np.percentile(values, q * 100)
+        assert abs(merged.quantile(q) - expected) <= 0.01 * expected
+
+def test_salary_accumulator_statistics():
+    values = [30000.0, 45000.5, 120000.0, 15000.25, 60000.0]
+    accumulator = SalaryAccumulator()
+    for value in values:
+        accumulator.add(value)
+    assert accumulator.count == 5
+    assert accumulator.sum() == math.fsum(values)
+    assert accumulator.min == 15000.25 and accumulator.max == 120000.0
+    assert accumulator.quantile(0) == 15000.25 and accumulator.quantile(1) == 120000.0
+    assert math.isnan(SalaryAccumulator().quantile(0.5))
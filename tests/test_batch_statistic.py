@@ -0,0 +1,50 @@
+import random
+import pytest
+from aho_corasick import AhoCorasick
+from task_342 import BatchStatistic, Statistic
+
+def naive_find(patterns: list, text: str) -> set:
+    return {index for index, pattern in enumerate(patterns) if pattern in text}
+
+@pytest.mark.parametrize("patterns, text", [
+    (["he", "she", "his", "hers"], "ushers"),
+    (["a", "aa", "aaa"], "aaaa"),
+    (["abc", "bc", "c", "d"], "xabcx"),
+    (["Программист", "Python", "программист"], "Старший Python-программист"),
+    (["C++", "C#", "C"], "Разработчик C#"),
+    (["", "x"], "abc"),
+    (["dup", "dup"], "a dup b"),
+    (["abc"], ""),
+])
+def test_find_known_cases(patterns, text):
+    assert AhoCorasick(patterns).find(text) == naive_find(patterns, text)
+
+def test_find_matches_naive_scan_on_random_input():
+    rng = random.Random(7)
+    for _ in range(300):
+        patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(1, 8))]
+        matcher = AhoCorasick(patterns)
+        for _ in range(10):
+            text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 20)))
+            assert matcher.find(text) == naive_find(patterns, text)
+
+PROFESSIONS = ["Программист", "Аналитик", "Python"]
+
+@pytest.fixture
+def vacancies_file(write_vacancies) -> str:
+    rng = random.Random(8)
+    names = ["Программист", "Python-программист", "Аналитик", "Бухгалтер", "Аналитик Python", "Водитель"]
+    return write_vacancies([[rng.choice(names), str(rng.randint(1, 30) * 1000), str(rng.randint(30, 60) * 1000), "RUR",
+                             "Москва", f"{rng.randint(2010, 2015)}-{rng.randint(1, 12):02}-01T10:00:00+0300"]
+                            for _ in range(400)])
+
+def test_batch_matches_single_profession_statistics(vacancies_file):
+    year_salary, year_vacancy, professions = BatchStatistic(PROFESSIONS).process_professions_stream(vacancies_file)
+    for profession in PROFESSIONS:
+        expected = Statistic(profession).process_data_stream(vacancies_file)
+        assert (year_salary, year_vacancy) + professions[profession] == expected
+
+def test_batch_process_data_stream_keeps_base_shape(vacancies_file):
+    result = BatchStatistic(PROFESSIONS).process_data_stream(vacancies_file)
+    assert result == Statistic(PROFESSIONS[0]).process_data_stream(vacancies_file)
+    assert len(result) == 4
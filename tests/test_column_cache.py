@@ -0,0 +1,52 @@
+import os
+import pytest
+from column_cache import ColumnCache, get_file_digest
+from task_342 import DataSet, SplitCsvFileByBytes, Statistic, group_by_area
+
+ROWS = [["Программист", "100000", "150000", "RUR", "Москва", "2019-07-01T10:00:00+0300"],
+        ["Аналитик данных", "", "80000", "RUR", "Казань", "2020-01-15T10:00:00+0300"],
+        ["Программист Python", "50000", "", "RUR", "Минск", "2020-03-02T10:00:00+0300"],
+        ["Программист C++", "200000", "250000", "RUR", "Санкт-Петербург", "2021-12-31T10:00:00+0300"],
+        ["Бухгалтер", "40000", "45000", "RUR", "Новосибирск", "2019-02-01T10:00:00+0300"]]
+
+def get_totals(param_salary: dict) -> dict:
+    return {year: (year_salary.count_vacancies, year_salary.salary) for year, year_salary in param_salary.items()}
+
+def build_cache(file_name: str, directory: str) -> tuple:
+    statistic = Statistic("Программист", {"area_name": group_by_area})
+    cache = ColumnCache(file_name, directory, chunk_size=3)
+    ranges = SplitCsvFileByBytes(file_name, chunk_size=64, block_size=16).ranges
+    partials = statistic.merge_partials(map(statistic.cache_range, [(cache, index, r) for index, r in enumerate(ranges)]))
+    cache.commit(len(ranges), statistic.columns)
+    return statistic, cache, partials
+
+def test_round_trip_matches_uncached_aggregate(tmp_path, write_vacancies):
+    file_name = write_vacancies(ROWS * 5)
+    statistic, cache, recorded = build_cache(file_name, str(tmp_path / "cache"))
+    assert ColumnCache(file_name, str(tmp_path / "cache")).is_complete()
+    assert len(cache.get_parts()) > 1
+    rows = [row for _, index in cache.get_parts() for row in cache.iter_rows(index, statistic.columns)]
+    expected_rows = list(DataSet.iter_rows(file_name, statistic.columns, only_valid=True))
+    assert rows == [(name, float(salary_from or 0), float(salary_to or 0), currency, area, published_at[:7])
+                    for name, salary_from, salary_to, currency, area, published_at in expected_rows]
+    cached = statistic.merge_partials(map(statistic.process_cached, cache.get_parts()))
+    expected = statistic.aggregate_rows(iter(expected_rows))
+    for result in (recorded, cached):
+        assert get_totals(result[0]) == get_totals(expected[0])
+        assert get_totals(result[1]) == get_totals(expected[1])
+        assert result[2].get_table("area_name") == expected[2].get_table("area_name")
+
+def test_commit_removes_stale_keys_of_the_same_source(tmp_path, write_vacancies):
+    directory = str(tmp_path / "cache")
+    other = build_cache(write_vacancies(ROWS[:3], "other.csv"), directory)[1]
+    file_name = write_vacancies(ROWS)
+    old = build_cache(file_name, directory)[1]
+    write_vacancies(ROWS * 2)
+    new = build_cache(file_name, directory)[1]
+    assert new.path != old.path
+    assert sorted(os.listdir(directory)) == sorted([os.path.basename(other.path), os.path.basename(new.path)])
+    assert not old.is_complete() and new.is_complete() and other.is_complete()
+
+def test_file_key_uses_file_digest(write_vacancies):
+    file_name = write_vacancies(ROWS)
+    assert ColumnCache.get_key(file_name) == f"{get_file_digest(file_name)[:32]}_{os.path.getsize(file_name)}"
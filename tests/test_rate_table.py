@@ -0,0 +1,64 @@
+import math
+import numpy as np
+from rate_table import RateTable, month_key
+
+def create_table() -> RateTable:
+    table = RateTable(["USD", "EUR"], month_key("2010-01"), month_key("2010-03"))
+    for month, usd, eur in (("2010-01", 30.0, 42.0), ("2010-02", 31.0, 43.0), ("2010-03", 32.0, 44.0)):
+        table.set(month_key(month), "USD", usd)
+        table.set(month_key(month), "EUR", eur)
+    return table
+
+def test_get_inside_range():
+    table = create_table()
+    assert table.get(month_key("01/2010"), "USD", 0) == 30.0
+    assert table.get(month_key("2010-03"), "EUR", 0) == 44.0
+
+def test_get_outside_range_returns_default():
+    table = create_table()
+    assert table.get(month_key("2009-12"), "USD", 0) == 0
+    assert table.get(month_key("2010-04"), "EUR", 0) == 0
+    assert math.isnan(table.get(month_key("2009-12"), "USD"))
+
+def test_get_unknown_currency_returns_default():
+    assert create_table().get(month_key("2010-02"), "KZT", 0) == 0
+
+def test_multipliers_outside_range_return_default():
+    table = create_table()
+    keys = [month_key("2009-12"), month_key("2010-02"), month_key("2010-04"), month_key("2010-01")]
+    result = table.multipliers(keys, ["USD", "EUR", "USD", "KZT"], 0)
+    np.testing.assert_array_equal(result, [0, 43.0, 0, 0])
+    assert np.isnan(table.multipliers(keys[:1], ["USD"])).all()
+
+def test_convert_outside_range_uses_default():
+    table = create_table()
+    result = table.convert([100, 100], [month_key("2009-11"), month_key("2010-03")], ["USD", "USD"], 0)
+    np.testing.assert_array_equal(result, [0, 3200.0])
+
+def test_process_valutes_outside_range_is_zero(tmp_path, monkeypatch):
+    import task_342
+    valutes_file = tmp_path / "valutes.csv"
+    valutes_file.write_text("date,USD\n01/2010,30.0\n02/2010,31.0\n", encoding="utf-8")
+    monkeypatch.setattr(task_342, "VALUTES_FILE", str(valutes_file))
+    assert task_342.ProcessValutes("12/2009", "USD").get_currency_valute() == 0
+    assert task_342.ProcessValutes("03/2010", "USD").get_currency_valute() == 0
+    assert task_342.ProcessValutes("02/2010", "USD").get_currency_valute() == 31.0
+
+def test_currency_memo_follows_rate_file(tmp_path, monkeypatch):
+    import os
+    import task_342
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    first.write_text("date,USD\n01/2010,30.0\n", encoding="utf-8")
+    second.write_text("date,USD\n01/2010,40.0\n", encoding="utf-8")
+    monkeypatch.setattr(task_342, "VALUTES_FILE", str(first))
+    task_342.load_valutes_table()
+    assert task_342.get_currency_valute("01/2010", "USD") == 30.0
+    monkeypatch.setattr(task_342, "VALUTES_FILE", str(second))
+    task_342.load_valutes_table()
+    assert task_342.get_currency_valute("01/2010", "USD") == 40.0
+    second.write_text("date,USD\n01/2010,50.0\n", encoding="utf-8")
+    os.utime(second, ns=(0, 10 ** 9))
+    vacancies = tmp_path / "vacancies.csv"
+    vacancies.write_text(",".join(task_342.Statistic.columns) + "\n", encoding="utf-8")
+    task_342.Statistic("Программист").get_result_key(str(vacancies))
+    assert task_342.get_currency_valute("01/2010", "USD") == 50.0
@@ -0,0 +1,67 @@
+import datetime
+import pytest
+from rates_cache import RatesCache
+
+DATE = "2020-01-01"
+RATES = {"USD": 61.9, "EUR": 69.3}
+
+class FakeFetch:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = RatesCache(str(tmp_path / "rates.sqlite"))
+    yield cache
+    cache.close()
+
+def test_is_fresh(cache):
+    today = datetime.date.today().isoformat()
+    assert cache.is_fresh(DATE, "ok", today, 0)
+    assert not cache.is_fresh(today, "ok", today, 0)
+    cache.retry_after = 60
+    assert cache.is_fresh(DATE, "failed", None, datetime.datetime.now().timestamp() - 30)
+    assert not cache.is_fresh(DATE, "failed", None, datetime.datetime.now().timestamp() - 90)
+
+def test_read_through_caches_fetched_rates(cache):
+    fetch = FakeFetch(RATES)
+    assert cache.read_through(DATE, fetch) == RATES
+    assert cache.read_through(DATE, fetch) == RATES
+    assert fetch.calls == 1
+    assert cache.missing([DATE, "2020-01-02"]) == ["2020-01-02"]
+    assert cache.last_date() == DATE
+
+def test_mark_failed_does_not_overwrite_ok(cache):
+    cache.put(DATE, RATES)
+    cache.mark_failed(DATE)
+    assert cache.get(DATE) == RATES
+    assert cache.conn.execute("SELECT status, attempts FROM fetches").fetchall() == [("ok", 1)]
+
+def test_failed_fetch_is_retried_after_window(cache):
+    fetch = FakeFetch(OSError("timeout"), {}, RATES)
+    assert cache.read_through(DATE, fetch) is None
+    assert cache.read_through(DATE, fetch) is None
+    assert fetch.calls == 1
+    cache.retry_after = 0
+    assert cache.read_through(DATE, fetch) is None
+    assert cache.read_through(DATE, fetch) == RATES
+    assert fetch.calls == 3
+    assert cache.conn.execute("SELECT status, attempts FROM fetches").fetchall() == [("ok", 3)]
+
+def test_failed_fetch_falls_back_to_stale_rates(cache):
+    today = datetime.date.today().isoformat()
+    cache.put(today, RATES)
+    assert cache.get(today) is None
+    fetch = FakeFetch(OSError("timeout"), {})
+    assert cache.read_through(today, fetch) == RATES
+    assert cache.read_through(today, fetch) == RATES
+    assert fetch.calls == 2
+    assert cache.conn.execute("SELECT status, attempts FROM fetches").fetchall() == [("ok", 1)]
@@ -0,0 +1,19 @@
+import openpyxl
+from task_342 import Report
+
+def test_sheet_title_sanitized():
+    assert Report.get_sheet_title("Распределение: по/годам [1]?*") == "Распределение погодам 1"
+    assert Report.get_sheet_title("a\\b" * 20) == ("ab" * 20)[:31]
+    assert Report.get_sheet_title("[]:*") == "Лист"
+
+def test_excel_styles(tmp_path):
+    file_name = str(tmp_path / "report.xlsx")
+    Report("Программист", [2020, 2021], [100, 200], [150, 250], [1, 2], [3, 4], file_name,
+           {"Города: топ/10": [["", "Доля"], ["Москва", None]]}).generate_excel()
+    workbook = openpyxl.load_workbook(file_name)
+    assert workbook.sheetnames == ["Статистика по годам", "Города топ10"]
+    header, cell = workbook.worksheets[0]["A1"], workbook.worksheets[0]["B2"]
+    assert header.font.b and header.alignment.horizontal == "left" and header.border.top.style == "thin"
+    assert not cell.font.b and cell.border.top.style == "thin" and cell.value == 100
+    assert workbook.worksheets[1]["B2"].value is None and workbook.worksheets[1]["B2"].border.top.style is None
+    assert workbook.worksheets[1]["A1"].border.top.style == "thin"
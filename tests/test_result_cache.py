@@ -0,0 +1,43 @@
+import os
+import pickle
+import pytest
+import subprocess
+import sys
+import task_342
+from result_cache import ResultCache
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS = [["Программист", "100000", "150000", "RUR", "Москва", "2021-07-01T10:00:00+0300"],
+        ["Аналитик", "50000", "", "RUR", "Минск", "2022-07-02T10:00:00+0300"],
+        ["Программист Python", "", "90000", "RUR", "Москва", "2022-03-02T10:00:00+0300"]]
+
+def test_unloadable_entry_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    entry = pickle.dumps(ResultCache, protocol=0)
+    with open(cache.get_entry_file("missing_class"), "wb") as file:
+        file.write(entry.replace(b"result_cache\nResultCache", b"__main__\nMissingType"))
+    with open(cache.get_entry_file("missing_module"), "wb") as file:
+        file.write(entry.replace(b"result_cache", b"no_such_module"))
+    with open(cache.get_entry_file("garbage"), "wb") as file:
+        file.write(b"not a pickle")
+    for key in ("missing_class", "missing_module", "garbage"):
+        assert cache.get(key, "miss") == "miss"
+    assert cache.get_or_compute("missing_class", lambda: 42) == 42
+    assert cache.get("missing_class") == 42
+
+def test_results_cached_by_cli_load_from_library(tmp_path, monkeypatch, write_vacancies):
+    file_name = write_vacancies(ROWS)
+    result = subprocess.run([sys.executable, os.path.join(REPO_DIRECTORY, "task_342.py"), "stats", file_name,
+                             "Программист", "--json"], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    entries = [entry for entry in os.listdir(tmp_path / "statistic_results") if entry.endswith(".pickle")]
+    assert entries
+    for entry in entries:
+        assert b"__main__" not in (tmp_path / "statistic_results" / entry).read_bytes()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(task_342, "process_file_parallel", lambda *args: pytest.fail("cached result was not used"))
+    stats, results, param_salary, param_salary_profession, groups = task_342.compute_statistics(file_name, ["Программист"])
+    assert {year: year_salary.count_vacancies for year, year_salary in param_salary.items()} == {"2021": 1, "2022": 2}
+    assert {year: year_salary.salary for year, year_salary in param_salary_profession.items()} == \
+           {"2021": 125000.0, "2022": 45000.0}
+    assert groups.get_table("area_name")["Москва"]["count"] == 2
@@ -0,0 +1,52 @@
+import pytest
+from task_342 import DataSet, SplitCsvFileByBytes, Statistic
+
+ROWS = [["Программист", "100000", "150000", "RUR", "Москва", "2019-07-01T10:00:00+0300"],
+        ["<p>Аналитик\nданных</p>", "", "80000", "RUR", "Казань", "2020-01-15T10:00:00+0300"],
+        ["Программист \"Python\", junior", "50000", "", "RUR", "Минск", "2020-03-02T10:00:00+0300"],
+        ["Тестировщик", "", "", "", "Москва", "2021-05-05T10:00:00+0300"],
+        ["Программист\n\"C++\"\n", "200000", "250000", "RUR", "Санкт-Петербург", "2021-12-31T10:00:00+0300"],
+        ["Бухгалтер", "40000", "45000", "RUR", "Новосибирск", "2019-02-01T10:00:00+0300"]]
+
+@pytest.fixture
+def vacancies_file(write_vacancies) -> str:
+    return write_vacancies(ROWS * 7)
+
+def read_ranges(split: SplitCsvFileByBytes) -> list:
+    return [row for file_name, headlines, start, end in split.ranges
+            for row in DataSet.iter_range_rows(file_name, headlines, start, end, Statistic.columns)]
+
+def get_totals(param_salary: dict) -> dict:
+    return {year: (year_salary.count_vacancies, year_salary.salary) for year, year_salary in param_salary.items()}
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 16, 33, 64, 100, 257, 4096])
+@pytest.mark.parametrize("block_size", [1, 3, 64, 1024 * 1024])
+def test_ranges_match_sequential_read(vacancies_file, chunk_size, block_size):
+    split = SplitCsvFileByBytes(vacancies_file, chunk_size=chunk_size, block_size=block_size)
+    assert read_ranges(split) == list(DataSet.iter_rows(vacancies_file, Statistic.columns, only_valid=True))
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 40, 1000])
+def test_ranges_are_contiguous(vacancies_file, chunk_size):
+    ranges = SplitCsvFileByBytes(vacancies_file, chunk_size=chunk_size, block_size=8).ranges
+    with open(vacancies_file, "rb") as file:
+        data = file.read()
+    assert ranges[0][2] == data.index(b"\n") + 1
+    assert ranges[-1][3] == len(data)
+    assert all(previous[3] == current[2] for previous, current in zip(ranges, ranges[1:]))
+    assert all(data[start - 1:start] == b"\n" for _, _, start, _ in ranges)
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 150, 1 << 20])
+def test_process_range_does_not_depend_on_chunk_size(vacancies_file, chunk_size):
+    statistic = Statistic("Программист")
+    split = SplitCsvFileByBytes(vacancies_file, chunk_size=chunk_size, block_size=16)
+    param_salary, param_salary_profession, _ = statistic.merge_partials(map(statistic.process_range, split.ranges))
+    expected_salary, expected_profession, _ = statistic.aggregate_rows(
+        DataSet.iter_rows(vacancies_file, Statistic.columns, only_valid=True))
+    assert get_totals(param_salary) == get_totals(expected_salary)
+    assert get_totals(param_salary_profession) == get_totals(expected_profession)
+    assert sum(count for count, _ in get_totals(param_salary).values()) == 5 * 7
+
+def test_empty_body_has_no_ranges(tmp_path):
+    file_name = tmp_path / "empty.csv"
+    file_name.write_text(",".join(Statistic.columns) + "\n", encoding="utf-8")
+    assert SplitCsvFileByBytes(str(file_name), chunk_size=4).ranges == []
@@ -0,0 +1,54 @@
+import os
+import task_342
+from task_342 import DataSet, SplitCsvFileByYear, Statistic
+
+ROWS = [["Программист", "100000", "150000", "RUR", "Москва", "2021-07-01T10:00:00+0300"],
+        ["Аналитик", "50000", "", "RUR", "Минск", "2019-07-02T10:00:00+0300"],
+        ["Программист Python", "", "90000", "RUR", "Москва", "2022-03-02T10:00:00+0300"],
+        ["Тестировщик", "", "", "", "Москва", "2020-05-05T10:00:00+0300"],
+        ["Программист C++", "200000", "250000", "RUR", "Казань", "2019-12-31T10:00:00+0300"],
+        ["Бухгалтер", "40000", "45000", "RUR", "Новосибирск", "2021-02-01T10:00:00+0300"]]
+
+def read_split(split: SplitCsvFileByYear) -> dict:
+    return {year: list(DataSet.iter_rows(split.get_year_file_name(year), Statistic.columns, only_valid=True))
+            for year in split.year_counts}
+
+def get_expected(file_name: str) -> dict:
+    expected = {}
+    for row in DataSet.iter_rows(file_name, Statistic.columns, only_valid=True):
+        expected.setdefault(row[-1][:4], []).append(row)
+    return expected
+
+def test_unsorted_input_with_evicted_writers(tmp_path, write_vacancies):
+    file_name = write_vacancies(ROWS * 3)
+    split = SplitCsvFileByYear(file_name, str(tmp_path / "split"), max_open_files=2)
+    assert split.year_counts == {"2021": 6, "2019": 6, "2022": 3}
+    assert read_split(split) == get_expected(file_name)
+    for year in split.year_counts:
+        with open(split.get_year_file_name(year), encoding="utf-8") as file:
+            assert file.read().count(",".join(Statistic.columns)) == 1
+
+def test_rerun_into_non_empty_directory(tmp_path, write_vacancies):
+    directory = str(tmp_path / "split")
+    other = SplitCsvFileByYear(write_vacancies(ROWS, "other.csv"), directory)
+    SplitCsvFileByYear(write_vacancies(ROWS * 4), directory)
+    file_name = write_vacancies(ROWS[:2])
+    split = SplitCsvFileByYear(file_name, directory)
+    assert split.year_counts == {"2021": 1, "2019": 1}
+    assert sorted(os.listdir(directory)) == sorted(
+        [os.path.basename(other.get_year_file_name(year)) for year in other.year_counts] +
+        ["vacancies_2019.csv", "vacancies_2021.csv"])
+    assert read_split(split) == get_expected(file_name)
+    assert read_split(other) == get_expected(str(tmp_path / "other.csv"))
+
+def test_split_by_year_ignores_other_sources(tmp_path, monkeypatch, write_vacancies):
+    monkeypatch.chdir(tmp_path)
+    SplitCsvFileByYear(write_vacancies(ROWS * 5, "other.csv"), task_342.directory)
+    file_name = write_vacancies(ROWS)
+    statistic = Statistic("Программист")
+    param_salary, param_salary_profession, _ = task_342.process_file_parallel(statistic, file_name, True)
+    expected_salary, expected_profession, _ = statistic.aggregate_rows(
+        DataSet.iter_rows(file_name, Statistic.columns, only_valid=True))
+    assert {year: year_salary.count_vacancies for year, year_salary in param_salary.items()} == \
+           {year: year_salary.count_vacancies for year, year_salary in expected_salary.items()}
+    assert sum(year_salary.count_vacancies for year_salary in param_salary.values()) == 5
@@ -0,0 +1,19 @@
+import task_342
+from task_342 import Statistic
+
+def test_merge_ranges_without_partials():
+    assert Statistic("Программист").merge_ranges([]) == ({}, {}, {}, {})
+
+def test_statistic_files_without_groups(monkeypatch):
+    stats = Statistic("Программист")
+    monkeypatch.setattr(task_342, "compute_statistics", lambda *args: (stats, None, {}, {}, None))
+    results, areas, files = task_342.get_statistic_files("vacancies.csv", ["Программист"])
+    assert areas == {}
+    assert [statistic_files.profession for statistic_files in files] == ["Программист"]
+
+def test_name_suffix_is_unique():
+    professions = ["C++", "C#", "C", "Программист", "Программист!"]
+    suffixes = [task_342.CreateStatisticFiles.get_name_suffix(profession) for profession in professions]
+    assert len(set(suffixes)) == len(professions)
+    assert suffixes[0].startswith("_C_") and suffixes[3].startswith("_Программист_")
+    assert suffixes == [task_342.CreateStatisticFiles.get_name_suffix(profession) for profession in professions]
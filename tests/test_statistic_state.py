@@ -0,0 +1,69 @@
+import os
+import pytest
+import subprocess
+import sys
+import task_342
+from task_342 import BatchStatistic, StatisticState
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_DUMP = [["Программист", "100000", "150000", "RUR", "Москва", "2022-07-01T10:00:00+0300"],
+              ["Аналитик", "50000", "", "RUR", "Минск", "2022-07-02T10:00:00+0300"]]
+SECOND_DUMP = FIRST_DUMP + [["Программист", "120000", "", "RUR", "Москва", "2022-07-03T10:00:00+0300"],
+                            ["Программист", "90000", "", "RUR", "Москва", "2022-06-30T10:00:00+0300"]]
+
+def test_update_skips_rows_below_watermark_and_counts_them(tmp_path, write_vacancies):
+    state = StatisticState(["Программист"], str(tmp_path / "state.json"))
+    assert state.update(write_vacancies(FIRST_DUMP, "d1.csv")) == 2
+    assert state.late_rows == 0
+    assert state.update(write_vacancies(SECOND_DUMP, "d2.csv")) == 1
+    assert state.late_rows == 3
+    assert state.update(str(tmp_path / "d2.csv")) == 0
+    assert state.get_statistics("Программист")[1] == {2022: 3}
+
+def test_update_without_watermark_keeps_late_rows(tmp_path, write_vacancies):
+    state = StatisticState(["Программист"], str(tmp_path / "state.json"))
+    state.update(write_vacancies(FIRST_DUMP[:1], "d1.csv"))
+    assert state.update(write_vacancies(SECOND_DUMP[3:], "d2.csv"), use_watermark=False) == 1
+    assert state.late_rows == 0
+    assert state.get_statistics("Программист")[3] == {2022: 2}
+
+def test_reloaded_state_matches_single_pass(tmp_path, write_vacancies):
+    file_name = write_vacancies(SECOND_DUMP, "d.csv")
+    StatisticState(["Программист", "Аналитик"], str(tmp_path / "state.json")).update(file_name, use_watermark=False)
+    state = StatisticState(["Программист", "Аналитик"], str(tmp_path / "state.json"))
+    year_salary, year_vacancy, professions = BatchStatistic(["Программист", "Аналитик"]).process_professions_stream(file_name)
+    for profession in ("Программист", "Аналитик"):
+        assert state.get_statistics(profession) == (year_salary, year_vacancy) + professions[profession]
+
+def test_state_saved_by_cli_loads_from_library(tmp_path, write_vacancies):
+    file_name = write_vacancies(FIRST_DUMP, "d.csv")
+    state_file = str(tmp_path / "state.json")
+    result = subprocess.run([sys.executable, os.path.join(REPO_DIRECTORY, "task_342.py"), "update", file_name,
+                             "Программист", "--state", state_file], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    with open(state_file, encoding="utf-8") as file:
+        assert "__main__" not in file.read()
+    assert StatisticState(["Программист"], state_file).get_statistics("Программист")[1] == {2022: 2}
+
+def test_state_loads_with_professions_in_another_order(tmp_path, write_vacancies):
+    state_file = str(tmp_path / "state.json")
+    StatisticState(["Программист", "Аналитик"], state_file).update(write_vacancies(FIRST_DUMP, "d1.csv"))
+    state = StatisticState(["Аналитик", "Программист"], state_file)
+    assert state.update(write_vacancies(SECOND_DUMP, "d2.csv")) == 1
+    assert state.get_statistics("Программист")[3] == {2022: 2}
+    with pytest.raises(ValueError):
+        StatisticState(["Программист"], state_file)
+
+def test_create_files_builds_a_report_set(tmp_path, monkeypatch, write_vacancies):
+    state = StatisticState(["Программист", "Аналитик"], str(tmp_path / "state.json"))
+    state.update(write_vacancies(FIRST_DUMP, "d.csv"))
+    calls = []
+    monkeypatch.setattr(task_342.CreateStatisticFiles, "create_report_set",
+                        lambda files, results=None, max_workers=4: calls.append((files, max_workers)))
+    state.create_files(max_workers=2)
+    [(files, max_workers)] = calls
+    assert max_workers == 2
+    assert [statistic_files.profession for statistic_files in files] == ["Программист", "Аналитик"]
+    assert [statistic_files.pdf_file for statistic_files in files] == \
+           [f"report{task_342.CreateStatisticFiles.get_name_suffix(profession)}.pdf"
+            for profession in ("Программист", "Аналитик")]
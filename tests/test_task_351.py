@@ -0,0 +1,71 @@
+import csv
+import os
+import sqlite3
+import pytest
+import task_342
+import task_351
+from generate_vacancies import generate_rows
+from task_342 import DataSet, Statistic
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def valutes_file(tmp_path) -> str:
+    with open(os.path.join(REPO_DIRECTORY, "dataframe51.csv"), encoding="utf-8") as source:
+        rows = list(csv.reader(source))
+    file_name = str(tmp_path / "valutes.csv")
+    with open(file_name, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(rows[0])
+        writer.writerows([row[0]] + [value or "0" for value in row[1:]] for row in rows[1:])
+    return file_name
+
+def count_rates(db_name: str) -> int:
+    with sqlite3.connect(db_name) as conn_db:
+        return conn_db.execute("SELECT count(*) FROM currencies").fetchone()[0]
+
+@pytest.mark.parametrize("profession", ["Программист", "Аналитик", "Водитель"])
+def test_year_statistics_match_statistic(tmp_path, monkeypatch, write_vacancies, valutes_file, profession):
+    file_name = write_vacancies(generate_rows(3000, seed=5))
+    db_name = str(tmp_path / "db.sqlite")
+    monkeypatch.setattr(task_342, "VALUTES_FILE", valutes_file)
+    task_342.load_valutes_table()
+    task_351.get_sql_from_csv(valutes_file, db_name)
+    rows = list(DataSet.iter_rows(file_name, Statistic.columns, only_valid=True))
+    assert task_351.load_vacancies(file_name, db_name, batch_size=700) == len(rows)
+    statistic = Statistic(profession)
+    param_salary, param_salary_profession, _ = statistic.aggregate_rows(rows)
+    assert task_351.get_year_statistics(profession, db_name) == statistic.convert_merged(param_salary, param_salary_profession)
+
+def test_load_vacancies_replaces_or_appends(tmp_path, write_vacancies):
+    file_name = write_vacancies(generate_rows(100, seed=6))
+    db_name = str(tmp_path / "db.sqlite")
+    count = task_351.load_vacancies(file_name, db_name)
+    assert task_351.load_vacancies(file_name, db_name) == count
+    assert task_351.query("SELECT count(*) FROM vacancies", db_name=db_name) == [(count,)]
+    task_351.load_vacancies(file_name, db_name, replace=False)
+    assert task_351.query("SELECT count(*) FROM vacancies", db_name=db_name) == [(2 * count,)]
+
+def test_upsert_change_counts(tmp_path, valutes_file):
+    db_name = str(tmp_path / "db.sqlite")
+    loaded = task_351.get_sql_from_csv(valutes_file, db_name)
+    assert loaded == count_rates(db_name) > 0
+    assert task_351.get_sql_from_csv(valutes_file, db_name) == 0
+    rows = [("2003-01", "USD", 30.0), ("2003-01", "EUR", 33.2719), ("2030-01", "USD", 90.0)]
+    assert task_351.upsert_rates(rows, db_name) == 2
+    assert task_351.upsert_rates(rows, db_name) == 0
+    assert count_rates(db_name) == loaded + 1
+    assert task_351.get_rates(["2003-01", "2030-01", "1999-01"], ["USD", "GBP"], db_name) == \
+           {("2003-01", "USD"): 30.0, ("2030-01", "USD"): 90.0}
+
+def test_wide_currencies_table_is_migrated(tmp_path):
+    db_name = str(tmp_path / "db.sqlite")
+    with sqlite3.connect(db_name) as conn_db:
+        conn_db.execute('CREATE TABLE currencies (date text, USD real, EUR real, "Unnamed: 0" real)')
+        conn_db.executemany("INSERT INTO currencies VALUES (?, ?, ?, ?)",
+                            [("2003-01", 31.78, 33.27, 1), ("2003-02", 31.83, None, 2)])
+    assert task_351.upsert_rates([("2003-02", "EUR", 34.43)], db_name) == 1
+    assert task_351.get_rates(["2003-01", "2003-02"], ["USD", "EUR", "Unnamed: 0"], db_name) == \
+           {("2003-01", "USD"): 31.78, ("2003-01", "EUR"): 33.27, ("2003-02", "USD"): 31.83, ("2003-02", "EUR"): 34.43}
+    assert [row[0] for row in task_351.query("SELECT name FROM sqlite_master WHERE type = 'table'", db_name=db_name)] == \
+           ["currencies"]